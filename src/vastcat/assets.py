@@ -1,25 +1,71 @@
 """Asset manifest + download helpers."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from types import MappingProxyType
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+import errno
 import hashlib
+import json
+import mmap
+import os
 import shutil
 import subprocess
+import sys
 import tarfile
-import tempfile
+import threading
 import zipfile
-import gzip
+import zlib
 import bz2
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
+try:
+    import py7zr
+except ImportError:  # optional: fall back to the external 7z binary
+    py7zr = None
+
+try:
+    import blake3
+except ImportError:  # optional: verify with SHA-256 instead
+    blake3 = None
+
 from .config import Config, ensure_config
+from .doctor import which
+
+# Downloads are network-bound and usually hit different hosts, so a small
+# pool overlaps them without hammering any single upstream.
+SYNC_WORKERS = 4
+# Large assets are split into byte ranges fetched over parallel connections
+# when the server advertises range support; small files aren't worth it.
+RANGE_SEGMENTS = 4
+RANGE_MIN_SIZE = 32 * 1024 * 1024
+# Formats that can be decompressed incrementally while the body streams in.
+STREAM_DECOMPRESS = {"gz", "bz2"}
+ARCHIVE_FORMATS = {"zip", "tar", "7z"} | STREAM_DECOMPRESS
+COPY_BLOCK = 8 * 1024 * 1024
+# Network reads: big enough that the per-chunk Python work (hash update,
+# progress tick, decompressor call) is noise next to the bytes moved.
+CHUNK_SIZE = 8 * 1024 * 1024
+HASH_BLOCK = 16 * 1024 * 1024
+# Rule files and short lists finish before a progress bar is worth drawing.
+PROGRESS_MIN_SIZE = 1024 * 1024
+# zlib releases the GIL while inflating, so zip members extract in parallel.
+ZIP_WORKERS = min(8, os.cpu_count() or 1)
+
 
+# ``slots`` needs Python 3.10; older interpreters just keep the instance dict.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class Asset:
     name: str
     category: str
@@ -29,9 +75,10 @@ class Asset:
     decompress: Optional[str] = None  # one of {"zip", "tar", "gz", "bz2"}
     output_name: Optional[str] = None
     description: str = ""
+    blake3_checksum: Optional[str] = None
 
 
-ASSET_LIBRARY: Dict[str, Asset] = {
+ASSET_LIBRARY: Mapping[str, Asset] = MappingProxyType({
     "rockyou": Asset(
         name="rockyou.txt",
         category="wordlists",
@@ -381,115 +428,492 @@ ASSET_LIBRARY: Dict[str, Asset] = {
         output_name="Top304Thousand-probable-v2.txt",
         description="Probable v2 top 304K passwords (by frequency, 2.7 MB)",
     ),
-}
+})
+
+
+def _index_by_category(library: Mapping[str, Asset]) -> Dict[str, Tuple[str, ...]]:
+    index: Dict[str, List[str]] = {}
+    for key, asset in library.items():
+        index.setdefault(asset.category, []).append(key)
+    return {category: tuple(keys) for category, keys in index.items()}
+
+
+# The library is read-only, so the per-category key lists can be built once.
+_BY_CATEGORY = _index_by_category(ASSET_LIBRARY)
+
+
+class _NotModified(Exception):
+    """Upstream answered 304: the asset on disk is still current."""
+
+
+@contextmanager
+def _raw_errors() -> Iterator[None]:
+    """Re-raise urllib3 errors from ``resp.raw`` reads as the requests errors ``iter_content`` gives."""
+    try:
+        yield
+    except ProtocolError as exc:
+        raise requests.exceptions.ChunkedEncodingError(exc) from exc
+    except DecodeError as exc:
+        raise requests.exceptions.ContentDecodingError(exc) from exc
+    except ReadTimeoutError as exc:
+        raise requests.exceptions.ConnectionError(exc) from exc
+    except SSLError as exc:
+        raise requests.exceptions.SSLError(exc) from exc
+
+
+class _TeeWriter:
+    """Write-only file wrapper that also feeds a progress bar and optional digest."""
+
+    def __init__(self, fh: BinaryIO, progress: tqdm, digest: Optional[Any] = None) -> None:
+        self._fh = fh
+        self._progress = progress
+        self._digest = digest
+
+    def write(self, data: bytes) -> int:
+        written = self._fh.write(data)
+        if self._digest is not None:
+            self._digest.update(data)
+        self._progress.update(len(data))
+        return written
+
+
+class _TeeReader:
+    """Read-only counterpart of :class:`_TeeWriter` for consumers that pull."""
+
+    def __init__(self, fh: BinaryIO, progress: tqdm, digest: Optional[Any] = None) -> None:
+        self._fh = fh
+        self._progress = progress
+        self._digest = digest
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fh.read(size)
+        if self._digest is not None:
+            self._digest.update(data)
+        self._progress.update(len(data))
+        return data
 
 
 class AssetManager:
     def __init__(self, config: Optional[Config] = None) -> None:
         self.config = config or ensure_config()
+        self._path_cache: Dict[Asset, Tuple[Path, Path]] = {}
+        self._category_dirs: Dict[str, Path] = {}
+        # One keep-alive pool shared by every download (and every range
+        # segment) so repeat hosts skip the TCP/TLS handshake. Transient
+        # gateway errors and dropped connects are retried with backoff.
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_connections=SYNC_WORKERS,
+            pool_maxsize=SYNC_WORKERS * RANGE_SEGMENTS,
+            max_retries=retry,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def sync(self, selection: Optional[Iterable[str]] = None, force: bool = False) -> List[Path]:
-        targets = selection or ASSET_LIBRARY.keys()
-        downloaded: List[Path] = []
+        targets = list(selection or ASSET_LIBRARY.keys())
+        ready: Dict[str, Path] = {}
+        pending: Dict[str, Asset] = {}
+        # One directory listing per category instead of a stat per asset.
+        listings: Dict[str, Set[str]] = {}
         for key in targets:
             asset = ASSET_LIBRARY.get(key)
             if not asset:
                 raise KeyError(f"Unknown asset '{key}'")
             final_path = self._output_path(asset)
-            if final_path.exists() and not force:
-                downloaded.append(final_path)
-                continue
-            downloaded.append(self._download(asset))
-        return downloaded
+            if not force:
+                if asset.category not in listings:
+                    listings[asset.category] = _dir_names(final_path.parent)
+                if final_path.name in listings[asset.category]:
+                    ready[key] = final_path
+                    continue
+            pending[key] = asset
+        # Files kept exactly as downloaded can be re-verified; hash them while
+        # the missing assets are still coming down the wire. The manifest
+        # remembers what was already verified, so untouched files are skipped.
+        manifest = self._load_manifest()
+        verifiable = {
+            key: _expected_checksum(ASSET_LIBRARY[key])[1]
+            for key in targets
+            if _expected_checksum(ASSET_LIBRARY[key])[1] and not ASSET_LIBRARY[key].decompress
+        }
+        verify = {
+            key: ASSET_LIBRARY[key]
+            for key in ready
+            if key in verifiable and manifest.get(key) != _manifest_entry(ready[key], verifiable[key])
+        }
+        if pending or verify:
+            workers = min(SYNC_WORKERS, len(pending) + len(verify))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {key: pool.submit(self._download, asset) for key, asset in pending.items()}
+                checks = {
+                    key: pool.submit(self._verify_checksum, ready[key], asset)
+                    for key, asset in verify.items()
+                }
+                for key, check in checks.items():
+                    try:
+                        check.result()
+                    except ValueError:
+                        # _verify_checksum already removed the bad copy.
+                        futures[key] = pool.submit(self._download, verify[key])
+                try:
+                    for future in as_completed(futures.values()):
+                        future.result()
+                except BaseException:
+                    # Fail fast: drop downloads that have not started yet.
+                    for future in futures.values():
+                        future.cancel()
+                    raise
+                for key, future in futures.items():
+                    ready[key] = future.result()
+        updated = dict(manifest)
+        for key, checksum in verifiable.items():
+            updated[key] = _manifest_entry(ready[key], checksum)
+        if updated != manifest:
+            self._save_manifest(updated)
+        return [ready[key] for key in targets]
+
+    def _manifest_path(self) -> Path:
+        return self.config.cache_dir / "manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self._manifest_path().read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        path = self._manifest_path()
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        os.replace(tmp, path)
+
+    def _paths(self, asset: Asset) -> Tuple[Path, Path]:
+        """Return ``(download target, output path)``, derived once per asset."""
+        paths = self._path_cache.get(asset)
+        if paths is None:
+            directory = self._category_dirs.get(asset.category)
+            if directory is None:
+                # asset_dir() mkdirs; do that once per category, not per asset.
+                directory = self._category_dirs[asset.category] = self.config.asset_dir(asset.category)
+            filename = asset.filename or Path(asset.url).name
+            paths = (directory / filename, directory / (asset.output_name or filename))
+            self._path_cache[asset] = paths
+        return paths
 
     def _download_target(self, asset: Asset) -> Path:
-        filename = asset.filename or Path(asset.url).name
-        return self.config.asset_dir(asset.category) / filename
+        return self._paths(asset)[0]
 
     def _output_path(self, asset: Asset) -> Path:
-        name = asset.output_name or asset.filename or Path(asset.url).name
-        return self.config.asset_dir(asset.category) / name
+        return self._paths(asset)[1]
 
     def _download(self, asset: Asset) -> Path:
+        target, output_path = self._paths(asset)
+        meta = self._load_meta(target)
+        # Only ask "has it changed?" when we still have the previous result.
+        conditional = _validators(meta) if output_path.exists() else {}
+        try:
+            fetched = self._download_ranged(asset, conditional)
+            if fetched is None and asset.decompress in STREAM_DECOMPRESS:
+                return self._download_decompressed(asset, output_path, conditional)
+            if fetched is None and asset.decompress == "tar":
+                return self._download_untarred(asset, output_path, conditional)
+            if fetched is None:
+                fetched = self._download_stream(asset, meta, conditional)
+            elif _expected_checksum(asset)[1]:
+                # Ranged chunks land out of order, so they can only be hashed afterwards.
+                self._verify_checksum(fetched[0], asset)
+        except _NotModified:
+            return output_path
+        tmp_path, headers, size = fetched
+        final_path = self._handle_compression(tmp_path, target, output_path, asset)
+        # Only now does the output match these validators.
+        self._save_meta(target, headers, size)
+        return final_path
+
+    def _meta_path(self, target: Path) -> Path:
+        return target.parent / ".meta" / f"{target.name}.json"
+
+    def _load_meta(self, target: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(self._meta_path(target).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_meta(self, target: Path, headers: Any, bytes_written: int) -> None:
+        """Record the validators of a freshly published output."""
+        self._write_meta(target, {**_header_validators(headers), "bytes_written": bytes_written})
+
+    def _save_partial_meta(self, target: Path, meta: Dict[str, Any], headers: Any) -> None:
+        """Record which upstream version the ``.part`` file belongs to.
+
+        Kept apart from the output's validators: the partial is not the
+        output until it has been published.
+        """
+        self._write_meta(target, {**meta, "partial": _header_validators(headers)})
+
+    def _write_meta(self, target: Path, meta: Dict[str, Any]) -> None:
+        path = self._meta_path(target)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path)
+
+    def _download_stream(
+        self, asset: Asset, meta: Dict[str, Any], conditional: Dict[str, str]
+    ) -> Tuple[Path, Any, int]:
+        """Stream ``asset`` into a ``.part`` file next to its target.
+
+        A ``.part`` left behind by an interrupted run is resumed with a
+        ``Range`` request, guarded by ``If-Range`` so a changed upstream file
+        restarts from scratch. Returns the part file, the response headers
+        and the number of bytes it holds.
+        """
         target = self._download_target(asset)
-        target.parent.mkdir(parents=True, exist_ok=True)
-        with requests.get(asset.url, stream=True, timeout=300) as resp:
+        part_path = target.with_name(target.name + ".part")
+        headers = dict(conditional)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        partial = meta.get("partial") or {}
+        validator = partial.get("etag") or partial.get("last_modified")
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        algorithm, expected = _expected_checksum(asset)
+        digest = _new_digest(algorithm) if expected else None
+        with self._session.get(asset.url, headers=headers, stream=True, timeout=300) as resp:
+            if resp.status_code == 304:
+                raise _NotModified
+            if resp.status_code == 416:
+                # Stale or already-complete partial: start over without resuming.
+                part_path.unlink(missing_ok=True)
+                return self._download_stream(asset, {**meta, "partial": {}}, conditional)
             resp.raise_for_status()
+            if resp.status_code != 206:
+                offset = 0
+            elif digest is not None:
+                with part_path.open("rb", buffering=0) as existing:
+                    _digest_stream(digest, existing)
+            self._save_partial_meta(target, meta, resp.headers)
             total = int(resp.headers.get("content-length", 0))
-            with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                progress = tqdm(
-                    total=total or None,
-                    unit="B",
-                    unit_scale=True,
-                    desc=f"Fetching {asset.name}",
-                )
-                for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                    if chunk:
-                        tmp.write(chunk)
+            with part_path.open("ab" if offset else "wb") as tmp:
+                _advise_sequential(tmp)
+                progress = _progress(asset, total + offset, initial=offset)
+                # Read straight off the socket; iter_content's generator adds a
+                # Python frame and a fresh bytes object per chunk.
+                resp.raw.decode_content = True
+                with _raw_errors():
+                    shutil.copyfileobj(resp.raw, _TeeWriter(tmp, progress, digest), CHUNK_SIZE)
+                progress.close()
+                written = tmp.tell()
+        if digest is not None and digest.hexdigest() != expected:
+            part_path.unlink(missing_ok=True)
+            raise ValueError("Checksum mismatch for downloaded asset")
+        return part_path, resp.headers, written
+
+    def _download_decompressed(self, asset: Asset, output_path: Path, conditional: Dict[str, str]) -> Path:
+        """Pipe a gz/bz2 response through its decompressor straight into ``output_path``.
+
+        The compressed bytes never touch disk; the checksum is computed over
+        them as they arrive.
+        """
+        algorithm, expected = _expected_checksum(asset)
+        digest = _new_digest(algorithm) if expected else None
+        decomp = _new_decompressor(asset.decompress)
+        staged = _staging_path(output_path)
+        try:
+            with self._session.get(asset.url, headers=conditional, stream=True, timeout=300) as resp:
+                if resp.status_code == 304:
+                    raise _NotModified
+                resp.raise_for_status()
+                total = int(resp.headers.get("content-length", 0))
+                progress = _progress(asset, total)
+                with open(staged, "wb") as dst:
+                    for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                        if digest is not None:
+                            digest.update(chunk)
                         progress.update(len(chunk))
+                        decomp = _inflate(decomp, asset.decompress, chunk, dst)
                 progress.close()
-                tmp_path = Path(tmp.name)
-        if asset.checksum:
-            self._verify_checksum(tmp_path, asset.checksum)
-        final_path = self._handle_compression(tmp_path, target, self._output_path(asset), asset)
-        return final_path
+            if not decomp.eof:
+                raise ValueError(f"Truncated {asset.decompress} stream for {asset.name}")
+            if digest is not None and digest.hexdigest() != expected:
+                raise ValueError("Checksum mismatch for downloaded asset")
+        except BaseException:
+            _discard(staged)
+            raise
+        _publish(staged, output_path)
+        self._save_meta(self._download_target(asset), resp.headers, int(resp.headers.get("content-length", 0)))
+        return output_path
+
+    def _download_untarred(self, asset: Asset, output_path: Path, conditional: Dict[str, str]) -> Path:
+        """Extract a tar response on the fly using tarfile's non-seeking ``r|*`` mode.
+
+        The archive itself is never written to disk; it is hashed as tarfile
+        pulls it off the socket.
+        """
+        algorithm, expected = _expected_checksum(asset)
+        digest = _new_digest(algorithm) if expected else None
+        staged = _staging_path(output_path)
+        _discard(staged)
+        try:
+            with self._session.get(asset.url, headers=conditional, stream=True, timeout=300) as resp:
+                if resp.status_code == 304:
+                    raise _NotModified
+                resp.raise_for_status()
+                total = int(resp.headers.get("content-length", 0))
+                progress = _progress(asset, total)
+                resp.raw.decode_content = True
+                reader = _TeeReader(resp.raw, progress, digest)
+                with _raw_errors():
+                    with tarfile.open(fileobj=reader, mode="r|*") as tf:
+                        tf.extractall(staged)
+                    # tarfile stops at the end-of-archive marker; hash the padding too.
+                    while reader.read(CHUNK_SIZE):
+                        pass
+                progress.close()
+            if digest is not None and digest.hexdigest() != expected:
+                raise ValueError("Checksum mismatch for downloaded asset")
+        except BaseException:
+            _discard(staged)
+            raise
+        _publish(staged, output_path)
+        self._save_meta(self._download_target(asset), resp.headers, total)
+        return output_path
+
+    def _download_ranged(
+        self, asset: Asset, conditional: Dict[str, str], segments: int = RANGE_SEGMENTS
+    ) -> Optional[Tuple[Path, Any, int]]:
+        """Fetch a large asset over several ``Range`` requests at once.
+
+        Returns the temp file, the ``HEAD`` headers and the size, or ``None`` when the server doesn't advertise byte ranges or the
+        asset is too small to benefit, so the caller can fall back to a
+        single stream.
+        """
+        if not hasattr(os, "pwrite"):
+            return None
+        try:
+            head = self._session.head(asset.url, headers=conditional, allow_redirects=True, timeout=30)
+        except requests.RequestException:
+            return None
+        if head.status_code == 304:
+            raise _NotModified
+        if not head.ok or head.headers.get("accept-ranges", "").lower() != "bytes":
+            return None
+        total = int(head.headers.get("content-length", 0))
+        if total < RANGE_MIN_SIZE:
+            return None
 
-    def _verify_checksum(self, file_path: Path, checksum: str) -> None:
-        digest = hashlib.sha256()
-        with file_path.open("rb") as fh:
-            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
-                digest.update(chunk)
-        if digest.hexdigest() != checksum:
+        url = head.url
+        step = -(-total // segments)
+        spans = [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+        lock = threading.Lock()
+        progress = _progress(asset, total)
+
+        # Sits next to the target so the final move is a same-filesystem rename.
+        # Kept apart from the resumable ``.part``: this file is sparse, not a prefix.
+        target = self._download_target(asset)
+        tmp_path = target.with_name(target.name + ".ranged.part")
+        with tmp_path.open("wb") as tmp:
+            fd = tmp.fileno()
+
+            def fetch(start: int, end: int) -> None:
+                headers = {"Range": f"bytes={start}-{end}"}
+                with self._session.get(url, headers=headers, stream=True, timeout=300) as resp:
+                    resp.raise_for_status()
+                    if resp.status_code != 206:
+                        raise RuntimeError(f"Server ignored range request for {asset.name}")
+                    offset = start
+                    for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                        os.pwrite(fd, chunk, offset)
+                        offset += len(chunk)
+                        with lock:
+                            progress.update(len(chunk))
+                if offset != end + 1:
+                    raise IOError(f"Incomplete range {start}-{end} for {asset.name}")
+
+            try:
+                _preallocate(fd, total)
+                with ThreadPoolExecutor(max_workers=len(spans)) as pool:
+                    for future in [pool.submit(fetch, start, end) for start, end in spans]:
+                        future.result()
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            finally:
+                progress.close()
+        return tmp_path, head.headers, total
+
+    def _verify_checksum(self, file_path: Path, asset: Asset) -> None:
+        algorithm, expected = _expected_checksum(asset)
+        if _hash_file(file_path, algorithm) != expected:
             file_path.unlink(missing_ok=True)
             raise ValueError("Checksum mismatch for downloaded asset")
 
     def _handle_compression(self, temp_path: Path, download_target: Path, output_path: Path, asset: Asset) -> Path:
-        if asset.decompress == "zip":
-            with zipfile.ZipFile(temp_path) as zf:
-                extract_dir = output_path
-                extract_dir.mkdir(parents=True, exist_ok=True)
-                zf.extractall(extract_dir)
-            temp_path.unlink(missing_ok=True)
+        if asset.decompress not in ARCHIVE_FORMATS:
+            # default: move file as-is; the .part sits beside the output, so this is a rename
+            os.replace(temp_path, output_path)
             return output_path
+        # Unpack beside the output and swap it in at the end, so an
+        # interrupted sync never leaves a half-written result behind.
+        staged = _staging_path(output_path)
+        _discard(staged)
+        try:
+            self._extract(temp_path, staged, asset)
+        except BaseException:
+            _discard(staged)
+            raise
+        _publish(staged, output_path)
+        temp_path.unlink(missing_ok=True)
+        return output_path
+
+    def _extract(self, temp_path: Path, dest: Path, asset: Asset) -> None:
+        if asset.decompress == "zip":
+            _extract_zip(temp_path, dest)
+            return
         if asset.decompress == "tar":
             with tarfile.open(temp_path) as tf:
-                tf.extractall(output_path)
-            temp_path.unlink(missing_ok=True)
-            return output_path
-        if asset.decompress == "gz":
-            with gzip.open(temp_path, "rb") as src, open(output_path, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-            temp_path.unlink(missing_ok=True)
-            return output_path
-        if asset.decompress == "bz2":
-            with bz2.open(temp_path, "rb") as src, open(output_path, "wb") as dst:
-                shutil.copyfileobj(src, dst)
-            temp_path.unlink(missing_ok=True)
-            return output_path
-        if asset.decompress == "7z":
-            # Extract 7z using system command
-            extract_dir = output_path
-            extract_dir.mkdir(parents=True, exist_ok=True)
+                tf.extractall(dest)
+            return
+        if asset.decompress in STREAM_DECOMPRESS:
+            # Raw decompressor objects skip GzipFile/BZ2File's per-read Python bookkeeping.
+            decomp = _new_decompressor(asset.decompress)
+            with temp_path.open("rb", buffering=0) as src, open(dest, "wb") as dst:
+                _advise_sequential(src)
+                for block in iter(lambda: src.read(COPY_BLOCK), b""):
+                    decomp = _inflate(decomp, asset.decompress, block, dst)
+            if not decomp.eof:
+                raise ValueError(f"Truncated {asset.decompress} stream for {asset.name}")
+            return
+        # 7z: extract in-process with py7zr when installed, else via the system 7z.
+        # VASTCAT_EXTERNAL_7Z forces the binary (it is faster on huge archives).
+        dest.mkdir(parents=True, exist_ok=True)
+        if py7zr is not None and not os.environ.get("VASTCAT_EXTERNAL_7Z"):
             try:
-                subprocess.run(
-                    ["7z", "x", str(temp_path), f"-o{extract_dir}", "-y"],
-                    check=True,
-                    capture_output=True
-                )
-            except FileNotFoundError:
-                raise RuntimeError(
-                    "7z command not found. Install p7zip: "
-                    "Ubuntu/Debian: sudo apt install p7zip-full | "
-                    "Fedora: sudo dnf install p7zip | "
-                    "macOS: brew install p7zip"
-                )
-            except subprocess.CalledProcessError as e:
-                raise RuntimeError(f"7z extraction failed: {e.stderr.decode()}")
-            temp_path.unlink(missing_ok=True)
-            return output_path
-        # default: move file as-is
-        shutil.move(str(temp_path), output_path)
-        return output_path
+                with py7zr.SevenZipFile(temp_path, mode="r") as archive:
+                    archive.extractall(path=dest)
+                return
+            except py7zr.exceptions.UnsupportedCompressionMethodError:
+                pass  # e.g. BCJ2 or PPMd archives; let 7z handle them
+        sevenzip = which("7z") or "7z"
+        try:
+            subprocess.run(
+                [sevenzip, "x", str(temp_path), f"-o{dest}", "-y"],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except FileNotFoundError:
+            raise RuntimeError(
+                "7z command not found. Install p7zip: "
+                "Ubuntu/Debian: sudo apt install p7zip-full | "
+                "Fedora: sudo dnf install p7zip | "
+                "macOS: brew install p7zip"
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"7z extraction failed: {e.stderr}")
 
     def resolved_paths(self, keys: Iterable[str]) -> List[Path]:
         paths: List[Path] = []
@@ -501,7 +925,195 @@ class AssetManager:
         return paths
 
 
+def _progress(asset: Asset, total: int, initial: int = 0) -> tqdm:
+    """Progress bar for a download; disabled when the body is known to be small."""
+    return tqdm(
+        total=total or None,
+        initial=initial,
+        unit="B",
+        unit_scale=True,
+        desc=f"Fetching {asset.name}",
+        disable=0 < total < PROGRESS_MIN_SIZE,
+    )
+
+
+def _manifest_entry(path: Path, checksum: str) -> Optional[Dict[str, Any]]:
+    """Describe a verified file so a later sync can tell it hasn't changed."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "checksum": checksum}
+
+
+def _expected_checksum(asset: Asset) -> Tuple[str, Optional[str]]:
+    """Return ``(algorithm, hexdigest)`` to check ``asset`` against.
+
+    BLAKE3 wins when the asset publishes one and the optional ``blake3``
+    package is installed; otherwise the SHA-256 ``checksum`` is used.
+    """
+    if asset.blake3_checksum and blake3 is not None:
+        return "blake3", asset.blake3_checksum
+    return "sha256", asset.checksum
+
+
+def _new_digest(algorithm: str) -> Any:
+    return blake3.blake3() if algorithm == "blake3" else hashlib.sha256()
+
+
+def _hash_file(file_path: Path, algorithm: str) -> str:
+    if algorithm == "blake3":
+        # Multi-threaded, SIMD hashing straight off a memory map.
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        return hasher.update_mmap(file_path).hexdigest()
+    return _sha256_file(file_path)
+
+
+def _sha256_file(file_path: Path) -> str:
+    """Hash a file in one C-level call by mapping it into memory."""
+    with file_path.open("rb") as fh:
+        try:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return hashlib.sha256(mm).hexdigest()
+        except (ValueError, OSError):
+            # Empty files can't be mapped; neither can some special filesystems.
+            fh.seek(0)
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        return _digest_stream(hashlib.sha256(), fh).hexdigest()
+
+
+def _digest_stream(digest: Any, fh: BinaryIO) -> Any:
+    """Feed ``fh`` into ``digest`` through one reusable buffer instead of a new bytes per read."""
+    view = memoryview(bytearray(HASH_BLOCK))
+    while True:
+        n = fh.readinto(view)
+        if not n:
+            return digest
+        digest.update(view[:n])
+
+
+def _dir_names(path: Path) -> Set[str]:
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def _header_validators(headers: Any) -> Dict[str, Optional[str]]:
+    return {"etag": headers.get("etag"), "last_modified": headers.get("last-modified")}
+
+
+def _validators(meta: Dict[str, Any]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _extract_zip(archive: Path, dest: Path) -> None:
+    """Extract ``archive`` into ``dest`` with members spread over a thread pool.
+
+    ``ZipFile`` handles aren't safe to share, so each worker opens its own.
+    """
+    with zipfile.ZipFile(archive) as zf:
+        members = zf.infolist()
+    dest.mkdir(parents=True, exist_ok=True)
+    # zipfile creates parent directories with a racy exists()/makedirs()
+    # pair, so lay the tree out before the workers start writing into it.
+    for info in members:
+        parts = [part for part in info.filename.split("/") if part not in ("", ".", "..")]
+        if not info.is_dir():
+            parts = parts[:-1]
+        if parts:
+            dest.joinpath(*parts).mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+    handles: List[zipfile.ZipFile] = []
+
+    def extract(info: zipfile.ZipInfo) -> None:
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(archive)
+            handles.append(zf)
+        zf.extract(info, dest)
+
+    try:
+        with ThreadPoolExecutor(max_workers=ZIP_WORKERS) as pool:
+            list(pool.map(extract, [info for info in members if not info.is_dir()]))
+    finally:
+        for zf in handles:
+            zf.close()
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve ``size`` bytes so range writers get contiguous extents.
+
+    A full disk then fails before any bytes are fetched instead of partway
+    through; filesystems without fallocate support just get a sparse file.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as exc:
+            if exc.errno == errno.ENOSPC:
+                raise
+    os.ftruncate(fd, size)
+
+
+def _advise_sequential(fh: BinaryIO) -> None:
+    """Tell the kernel ``fh`` is accessed front to back (read-ahead, early page reclaim)."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _staging_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".tmp")
+
+
+def _discard(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _publish(staged: Path, output_path: Path) -> None:
+    """Swap a finished file or directory into place with a rename."""
+    if staged.is_dir() and output_path.is_dir():
+        shutil.rmtree(output_path)
+    os.replace(staged, output_path)
+
+
+def _new_decompressor(kind: Optional[str]):
+    if kind == "gz":
+        return zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    if kind == "bz2":
+        return bz2.BZ2Decompressor()
+    raise ValueError(f"Cannot stream-decompress '{kind}'")
+
+
+def _inflate(decomp: Any, kind: str, data: bytes, dst: BinaryIO) -> Any:
+    """Decompress ``data`` into ``dst`` and return the decompressor to feed next.
+
+    Concatenated members (``gzip -c a b``, pbzip2 output) each get a fresh
+    decompressor once the previous one reports end-of-stream.
+    """
+    while data:
+        if decomp.eof:
+            decomp = _new_decompressor(kind)
+        dst.write(decomp.decompress(data))
+        data = decomp.unused_data if decomp.eof else b""
+    return decomp
+
+
 def list_assets(category: Optional[str] = None) -> List[str]:
     if not category:
         return list(ASSET_LIBRARY.keys())
-    return [key for key, asset in ASSET_LIBRARY.items() if asset.category == category]
+    return list(_BY_CATEGORY.get(category, ()))
@@ -2,30 +2,36 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+import functools
 import os
-import shlex
-import shutil
+import sys
 
 import typer
-from rich.console import Console
 
-from .assets import ASSET_LIBRARY, AssetManager, list_assets
-from .config import ensure_config
-from .deployment import render_hashcat_command, render_startup_script
-from .hashcat import HashcatRunner
-from .notifier import Notifier
-from .theme import cat_say
-from .wizard import Wizard
+# Subcommand dependencies (rich, requests, questionary, name-that-hash) are
+# imported inside the commands that use them so --help stays fast.
+if TYPE_CHECKING:
+    from rich.console import Console
 
-app = typer.Typer(help="Cat-themed hashcat orchestrator")
-assets_app = typer.Typer(help="Manage wordlists and rules")
-app.add_typer(assets_app, name="assets")
+
+@functools.lru_cache(maxsize=1)
+def _console() -> Console:
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.lru_cache(maxsize=1)
+def _hashcat_path() -> Optional[str]:
+    from .doctor import find_hashcat
+
+    return find_hashcat()
 
 
 def check_hashcat_with_warning(console: Console) -> bool:
     """Check if hashcat is installed and warn if not."""
-    if shutil.which("hashcat"):
+    if _hashcat_path():
         return True
 
     # Try automatic installation
@@ -33,20 +39,16 @@ def check_hashcat_with_warning(console: Console) -> bool:
     console.print("[dim]Attempting automatic installation...[/dim]\n")
 
     try:
+        from .doctor import clear_which_cache
         from .install_hashcat import download_and_install_hashcat
 
-        # Suppress verbose output during automatic installation
-        import io
-        import sys
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-
-        try:
-            success = download_and_install_hashcat(verbose=False)
-        finally:
-            sys.stdout = old_stdout
+        # Quiet install; our own messages below report the outcome
+        success = download_and_install_hashcat(verbose=False)
 
-        if success and shutil.which("hashcat"):
+        # The miss above was cached, as was which()'s; drop both so the lookup re-probes.
+        _hashcat_path.cache_clear()
+        clear_which_cache()
+        if success and _hashcat_path():
             console.print("[green]✓ Hashcat installed successfully![/green]\n")
             return True
         else:
@@ -62,9 +64,10 @@ def check_hashcat_with_warning(console: Console) -> bool:
     return False
 
 
-@assets_app.command("list")
 def assets_list(category: Optional[str] = typer.Option(None, "--category", "-c")) -> None:
-    console = Console()
+    from .assets import ASSET_LIBRARY, AssetManager, list_assets
+
+    console = _console()
     manager = AssetManager()
     names = list_assets(category)
     if not names:
@@ -75,20 +78,21 @@ def assets_list(category: Optional[str] = typer.Option(None, "--category", "-c")
         console.print(f"[bold]{key}[/bold]: {asset.description or asset.name} -> {manager.resolved_paths([key])[0]}")
 
 
-@assets_app.command("sync")
 def assets_sync(
     names: List[str] = typer.Argument(None),
     force: bool = typer.Option(False, "--force", help="Re-download assets"),
 ) -> None:
+    from .assets import AssetManager
+    from .theme import cat_say
+
     manager = AssetManager()
     targets = names or None
     paths = manager.sync(targets, force=force)
-    console = Console()
+    console = _console()
     for path in paths:
         console.print(cat_say(f"Ready: {path}"))
 
 
-@app.command()
 def run(
     hash_file: Path = typer.Argument(..., help="File containing hashes"),
     hash_mode: str = typer.Option("0", "--mode", "-m"),
@@ -99,11 +103,16 @@ def run(
     dry_run: bool = typer.Option(False, help="Only print the command"),
 ) -> None:
     """Run hashcat with manual parameters."""
-    console = Console()
+    from .config import ensure_config
+    from .deployment import render_hashcat_argv
+    from .hashcat import HashcatRunner
+    from .notifier import Notifier
+
+    console = _console()
     if not check_hashcat_with_warning(console):
         raise typer.Exit(1)
 
-    command = render_hashcat_command(
+    argv = render_hashcat_argv(
         hash_path=str(hash_file),
         hash_mode=hash_mode,
         attack_mode=attack_mode,
@@ -112,113 +121,192 @@ def run(
         extra_args=extra,
     )
     runner = HashcatRunner(notifier=Notifier(ensure_config().get("discord_webhook")))
-    runner.run(shlex.split(command)[1:], dry_run=dry_run)
+    runner.run(argv, dry_run=dry_run)
+
+
+def detect_all(hash_file: Path = typer.Argument(..., help="File containing hashes")) -> None:
+    """Count the detected hash modes across a whole hashlist."""
+    from .detect import detect_hash_modes_batch
+
+    console = _console()
+    try:
+        with hash_file.expanduser().open("rb") as handle:
+            counts = detect_hash_modes_batch(handle)
+    except OSError as e:
+        console.print(f"[red]✗[/red] Cannot read {hash_file}: {e}")
+        raise typer.Exit(1)
+    if not counts:
+        console.print("No hashes found.")
+        return
+    console.print("\n".join(f"[bold]{mode}[/bold]: {count}" for mode, count in counts.most_common()))
 
 
-@app.command()
 def wizard() -> None:
     """Start the interactive configuration wizard."""
-    console = Console()
+    from .wizard import Wizard
+
+    console = _console()
     check_hashcat_with_warning(console)
     Wizard(console).run()
 
 
-@app.command(name="doctor")
 def doctor() -> None:
     """Check vastcat setup and dependencies."""
-    console = Console()
-    console.print("\n[bold cyan]VastCat Setup Check[/bold cyan]\n")
-
-    # Check hashcat - try local installation first
-    local_hashcat = Path.home() / ".local" / "share" / "vastcat" / "hashcat" / "hashcat"
-    local_bin = Path.home() / ".local" / "bin" / "hashcat"
-    system_hashcat = shutil.which("hashcat")
-
-    hashcat_found = False
-    hashcat_path = None
-
-    if local_hashcat.exists() and os.access(local_hashcat, os.X_OK):
-        hashcat_path = str(local_hashcat)
-        hashcat_found = True
-        console.print(f"[green]✓[/green] Hashcat (local): [dim]{hashcat_path}[/dim]")
-    elif local_bin.exists() and os.access(local_bin, os.X_OK):
-        hashcat_path = str(local_bin)
-        hashcat_found = True
-        console.print(f"[green]✓[/green] Hashcat (local): [dim]{hashcat_path}[/dim]")
-    elif system_hashcat:
-        hashcat_path = system_hashcat
-        hashcat_found = True
-        console.print(f"[green]✓[/green] Hashcat (system): [dim]{hashcat_path}[/dim]")
-    else:
-        console.print("[red]✗[/red] Hashcat not found")
-        console.print("  [dim]Try reinstalling: pip install --force-reinstall vastcat[/dim]")
-        console.print("  [dim]Or run: vastcat install-hashcat[/dim]")
+    from .config import ensure_config
+    from .doctor import find_hashcat, is_local_install
 
-    if hashcat_found and hashcat_path:
+    # Collected and printed in one go rather than one render per line
+    lines = ["\n[bold cyan]VastCat Setup Check[/bold cyan]\n"]
+
+    # Re-probe so doctor also refreshes the cached detection
+    hashcat_path = find_hashcat(refresh=True)
+
+    if hashcat_path:
+        label = "local" if is_local_install(hashcat_path) else "system"
+        lines.append(f"[green]✓[/green] Hashcat ({label}): [dim]{hashcat_path}[/dim]")
         # Try to get version
         import subprocess
         try:
-            result = subprocess.run([hashcat_path, "--version"], capture_output=True, text=True, timeout=5)
+            result = subprocess.run(
+                [hashcat_path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=5
+            )
             if result.returncode == 0:
-                version = result.stdout.strip().split('\n')[0]
-                console.print(f"  [dim]Version: {version}[/dim]")
+                version = result.stdout.strip().split(b"\n", 1)[0].decode("ascii", "replace")
+                lines.append(f"  [dim]Version: {version}[/dim]")
         except Exception:
             pass
+    else:
+        lines.append("[red]✗[/red] Hashcat not found")
+        lines.append("  [dim]Run: vastcat install-hashcat[/dim]")
 
     # Check name-that-hash
     try:
         from vastcat.detect import NTH_AVAILABLE
         if NTH_AVAILABLE:
             import name_that_hash
-            console.print(f"[green]✓[/green] name-that-hash available: [dim]v{name_that_hash.__version__}[/dim]")
+            lines.append(f"[green]✓[/green] name-that-hash available: [dim]v{name_that_hash.__version__}[/dim]")
         else:
-            console.print("[yellow]⚠[/yellow] name-that-hash not available (using regex fallback)")
+            lines.append("[yellow]⚠[/yellow] name-that-hash not available (using regex fallback)")
     except Exception as e:
-        console.print(f"[red]✗[/red] Error checking name-that-hash: {e}")
+        lines.append(f"[red]✗[/red] Error checking name-that-hash: {e}")
 
     # Check config
     try:
-        config = ensure_config()
+        ensure_config()
         config_file = Path.home() / ".config" / "vastcat" / "config.yaml"
-        console.print(f"[green]✓[/green] Config file: [dim]{config_file}[/dim]")
+        lines.append(f"[green]✓[/green] Config file: [dim]{config_file}[/dim]")
     except Exception as e:
-        console.print(f"[yellow]⚠[/yellow] Config issue: {e}")
+        lines.append(f"[yellow]⚠[/yellow] Config issue: {e}")
 
     # Check cache directory
     cache_dir = Path.home() / ".cache" / "vastcat"
     if cache_dir.exists():
-        console.print(f"[green]✓[/green] Cache directory: [dim]{cache_dir}[/dim]")
+        lines.append(f"[green]✓[/green] Cache directory: [dim]{cache_dir}[/dim]")
     else:
-        console.print(f"[dim]  Cache directory will be created on first use[/dim]")
+        lines.append("[dim]  Cache directory will be created on first use[/dim]")
 
-    console.print("\n[bold]Status:[/bold]")
+    lines.append("\n[bold]Status:[/bold]")
     if hashcat_path:
-        console.print("  [green]Ready to crack![/green] Run [cyan]vastcat wizard[/cyan] to get started.\n")
+        lines.append("  [green]Ready to crack![/green] Run [cyan]vastcat wizard[/cyan] to get started.\n")
     else:
-        console.print("  [yellow]Install hashcat to begin.[/yellow] Run [cyan]vastcat install-hashcat[/cyan] for instructions.\n")
+        lines.append("  [yellow]Install hashcat to begin.[/yellow] Run [cyan]vastcat install-hashcat[/cyan] for instructions.\n")
+
+    _console().print("\n".join(lines))
+
+
+_INSTALL_INSTRUCTIONS = """
+[bold cyan]Hashcat Installation Instructions[/bold cyan]
+
+[bold]Option 1: Package Manager (Recommended)[/bold]
+  Ubuntu/Debian: [cyan]sudo apt update && sudo apt install -y hashcat[/cyan]
+  Fedora/RHEL:   [cyan]sudo dnf install -y hashcat[/cyan]
+  Arch Linux:    [cyan]sudo pacman -S hashcat[/cyan]
+  macOS:         [cyan]brew install hashcat[/cyan]
+
+[bold]Option 2: From Source (Latest Version)[/bold]
+  1. Download:  [cyan]wget https://hashcat.net/files/hashcat-7.1.2.tar.gz[/cyan]
+  2. Extract:   [cyan]tar -xzf hashcat-7.1.2.tar.gz[/cyan]
+  3. Build:     [cyan]cd hashcat-7.1.2 && make[/cyan]
+  4. Install:   [cyan]sudo make install[/cyan]
+  Or symlink:   [cyan]sudo ln -s $(pwd)/hashcat /usr/local/bin/hashcat[/cyan]
+
+[bold]Verify Installation:[/bold]
+  [cyan]hashcat --version[/cyan]
+  [cyan]vastcat doctor[/cyan]
+
+[dim]After installation, run 'vastcat wizard' to start cracking![/dim]
+"""
 
 
-@app.command(name="install-hashcat")
 def install_hashcat() -> None:
     """Display instructions for installing hashcat."""
-    console = Console()
-    console.print("\n[bold cyan]Hashcat Installation Instructions[/bold cyan]\n")
-
-    console.print("[bold]Option 1: Package Manager (Recommended)[/bold]")
-    console.print("  Ubuntu/Debian: [cyan]sudo apt update && sudo apt install -y hashcat[/cyan]")
-    console.print("  Fedora/RHEL:   [cyan]sudo dnf install -y hashcat[/cyan]")
-    console.print("  Arch Linux:    [cyan]sudo pacman -S hashcat[/cyan]")
-    console.print("  macOS:         [cyan]brew install hashcat[/cyan]")
-
-    console.print("\n[bold]Option 2: From Source (Latest Version)[/bold]")
-    console.print("  1. Download:  [cyan]wget https://hashcat.net/files/hashcat-7.1.2.tar.gz[/cyan]")
-    console.print("  2. Extract:   [cyan]tar -xzf hashcat-7.1.2.tar.gz[/cyan]")
-    console.print("  3. Build:     [cyan]cd hashcat-7.1.2 && make[/cyan]")
-    console.print("  4. Install:   [cyan]sudo make install[/cyan]")
-    console.print("  Or symlink:   [cyan]sudo ln -s $(pwd)/hashcat /usr/local/bin/hashcat[/cyan]")
-
-    console.print("\n[bold]Verify Installation:[/bold]")
-    console.print("  [cyan]hashcat --version[/cyan]")
-    console.print("  [cyan]vastcat doctor[/cyan]")
-
-    console.print("\n[dim]After installation, run 'vastcat wizard' to start cracking![/dim]\n")
+    _console().print(_INSTALL_INSTRUCTIONS)
+
+
+def _print_version(value: bool) -> None:
+    if value:
+        from . import __version__
+
+        typer.echo(__version__)
+        raise typer.Exit()
+
+
+def _serve_daemon(value: bool) -> None:
+    if value:
+        from .daemon import serve
+
+        serve()
+        raise typer.Exit()
+
+
+def _root(
+    version: bool = typer.Option(
+        False, "--version", "-V", callback=_print_version, is_eager=True, help="Show the version and exit."
+    ),
+    daemon: bool = typer.Option(
+        False, "--daemon", callback=_serve_daemon, is_eager=True, help="Serve commands from a background process."
+    ),
+) -> None:
+    """Cat-themed hashcat orchestrator"""
+
+
+@functools.lru_cache(maxsize=None)
+def _build_app() -> typer.Typer:
+    app = typer.Typer(help="Cat-themed hashcat orchestrator")
+    app.callback()(_root)
+    assets_app = typer.Typer(help="Manage wordlists and rules")
+    assets_app.command("list")(assets_list)
+    assets_app.command("sync")(assets_sync)
+    app.add_typer(assets_app, name="assets")
+    app.command()(run)
+    app.command(name="detect-all")(detect_all)
+    app.command()(wizard)
+    app.command(name="doctor")(doctor)
+    app.command(name="install-hashcat")(install_hashcat)
+    return app
+
+
+def __getattr__(name: str):
+    # ``vastcat.cli:app`` keeps working for tooling that imports the Typer app.
+    if name == "app":
+        return _build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main() -> None:
+    """Console-script entry point; answers ``--version`` without building the app.
+
+    With ``VASTCAT_DAEMON`` set, commands go to a running ``vastcat --daemon`` when one is listening.
+    """
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        from . import __version__
+
+        print(__version__)
+        return
+    if os.environ.get("VASTCAT_DAEMON"):
+        from .daemon import forward
+
+        code = forward(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+    _build_app()()
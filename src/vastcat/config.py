@@ -3,10 +3,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
+import copy
+import functools
 import os
 import yaml
 
+# libyaml's C loader/dumper when PyYAML was built with it; same safe subset either way.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 CONFIG_PATH = Path(os.environ.get("VASTCAT_CONFIG", "~/.config/vastcat/config.yaml")).expanduser()
 DEFAULTS: Dict[str, Any] = {
     "cache_dir": str(Path(os.environ.get("VASTCAT_CACHE", "~/.cache/vastcat")).expanduser()),
@@ -16,6 +22,11 @@ DEFAULTS: Dict[str, Any] = {
     "auto_download_assets": True,
     "asset_manifest": "~/.config/vastcat/assets.yaml",
 }
+# Snapshot taken once at import; Config.load() builds its fresh dict from this.
+_DEFAULTS_FROZEN = tuple(DEFAULTS.items())
+
+# path -> (st_mtime_ns, st_size, parsed mapping); saves re-parsing YAML that hasn't changed.
+_CONFIG_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
 
 
 @dataclass
@@ -23,47 +34,69 @@ class Config:
     """Serializable config with a little sugar."""
 
     data: Dict[str, Any] = field(default_factory=dict)
+    # Directories this instance already created, so repeat lookups skip mkdir.
+    _ensured: Set[Path] = field(default_factory=set, init=False, repr=False, compare=False)
 
     @classmethod
     def load(cls) -> "Config":
-        if CONFIG_PATH.exists():
-            loaded = yaml.safe_load(CONFIG_PATH.read_text()) or {}
-        else:
-            loaded = {}
-        defaults = DEFAULTS.copy()
+        loaded = _read_config(CONFIG_PATH)
+        defaults = dict(_DEFAULTS_FROZEN)
         defaults.update(loaded)
         return cls(defaults)
 
     def save(self) -> None:
         CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        CONFIG_PATH.write_text(yaml.safe_dump(self.data, sort_keys=True))
+        CONFIG_PATH.write_text(yaml.dump(self.data, Dumper=_Dumper, sort_keys=True))
+        st = CONFIG_PATH.stat()
+        _CONFIG_CACHE[CONFIG_PATH] = (st.st_mtime_ns, st.st_size, copy.deepcopy(self.data))
 
     def get(self, key: str, default: Optional[Any] = None) -> Any:
         return self.data.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         self.data[key] = value
+        if key == "cache_dir":
+            self.__dict__.pop("cache_dir", None)
         self.save()
 
-    @property
+    @functools.cached_property
     def cache_dir(self) -> Path:
-        path = Path(self.data["cache_dir"]).expanduser()
-        path.mkdir(parents=True, exist_ok=True)
-        return path
+        return self._ensure(Path(self.data["cache_dir"]).expanduser())
 
     @property
     def hashes_dir(self) -> Path:
-        path = Path(self.data["hashes_dir"]).expanduser()
-        path.mkdir(parents=True, exist_ok=True)
-        return path
+        return self._ensure(Path(self.data["hashes_dir"]).expanduser())
 
     def asset_dir(self, category: str) -> Path:
-        base = self.cache_dir / category
-        base.mkdir(parents=True, exist_ok=True)
-        return base
+        return self._ensure(self.cache_dir / category)
 
+    def _ensure(self, path: Path) -> Path:
+        if path not in self._ensured:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured.add(path)
+        return path
+
+
+def _read_config(path: Path) -> Dict[str, Any]:
+    """Parse ``path``, reusing the previous result while its mtime and size are unchanged."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+        cached = (st.st_mtime_ns, st.st_size, yaml.load(path.read_text(), Loader=_Loader) or {})
+        _CONFIG_CACHE[path] = cached
+    return copy.deepcopy(cached[2])
 
+
+@functools.lru_cache(maxsize=1)
 def ensure_config() -> Config:
+    """Load (creating if needed) the user config once per process.
+
+    Every caller shares the returned instance, so ``Config.set`` updates are
+    visible everywhere; call ``ensure_config.cache_clear()`` to force a reload.
+    """
     cfg = Config.load()
     if not CONFIG_PATH.exists():
         cfg.save()
@@ -0,0 +1,185 @@
+"""Opt-in local daemon that runs CLI commands in a warm interpreter.
+
+``vastcat --daemon`` listens on a Unix socket; with ``VASTCAT_DAEMON=1`` set,
+later ``vastcat`` invocations hand their arguments to it and relay its output,
+skipping the Python/typer/rich start-up cost. Requests are handled one at a
+time because output and the caller's environment (``PATH``, API key, hashcat
+override) are swapped in process-wide for the length of each request.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+# Mirrors DEFAULTS["cache_dir"] without importing config (and yaml) on the client side.
+SOCKET_PATH = Path(os.environ.get("VASTCAT_CACHE", "~/.cache/vastcat")).expanduser() / "daemon.sock"
+
+# These need the caller's terminal (prompts, hashcat's live status), so they never go to the daemon.
+_LOCAL_COMMANDS = {"run", "wizard"}
+
+# Read on every lookup, so the caller's values are applied for the length of its request.
+_FORWARDED_ENV = ("PATH", "VAST_API_KEY", "HASHCAT_BINARY", "VASTCAT_EXTERNAL_7Z")
+
+# Baked into module-level defaults at import; a caller that differs runs in-process instead.
+_PINNED_ENV = ("VASTCAT_CONFIG", "VASTCAT_CACHE")
+
+
+class _FrameWriter:
+    """Text stream that relays each write to the client as a JSON line."""
+
+    encoding = "utf-8"
+
+    def __init__(self, wfile: BinaryIO, key: str) -> None:
+        self._wfile = wfile
+        self._key = key
+        self._closed = False
+
+    def write(self, data: str) -> int:
+        if data and not self._closed:
+            try:
+                self._wfile.write(json.dumps({self._key: data}).encode() + b"\n")
+            except OSError:
+                # The client hung up; let the command finish without output.
+                self._closed = True
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._closed:
+            try:
+                self._wfile.flush()
+            except OSError:
+                self._closed = True
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline() or b"{}")
+        env = request.get("env") or {}
+        if any(env.get(name) != os.environ.get(name) for name in _PINNED_ENV):
+            with contextlib.suppress(OSError):
+                self.wfile.write(json.dumps({"local": True}).encode() + b"\n")
+            return
+        out = _FrameWriter(self.wfile, "out")
+        err = _FrameWriter(self.wfile, "err")
+        previous = os.getcwd()
+        try:
+            os.chdir(request.get("cwd") or previous)
+            with _environ({name: env.get(name) for name in _FORWARDED_ENV}):
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                    code = _dispatch(request.get("argv") or [])
+        finally:
+            os.chdir(previous)
+        with contextlib.suppress(OSError):
+            self.wfile.write(json.dumps({"exit": code}).encode() + b"\n")
+
+
+@contextlib.contextmanager
+def _environ(values: Dict[str, Optional[str]]) -> Iterator[None]:
+    """Apply ``values`` to ``os.environ`` (``None`` unsets) and restore it afterwards."""
+    saved = {name: os.environ.get(name) for name in values}
+
+    def apply(items: Dict[str, Optional[str]]) -> None:
+        for name, value in items.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    apply(values)
+    try:
+        yield
+    finally:
+        apply(saved)
+
+
+def _reset_caches() -> None:
+    """Drop the per-process caches so each request sees the current config and installs."""
+    from . import cli, config, doctor
+
+    # A fresh Config also starts with an empty set of created directories.
+    config.ensure_config.cache_clear()
+    cli._hashcat_path.cache_clear()
+    doctor.clear_which_cache()
+    doctor._found = None
+
+
+def _dispatch(argv: List[str]) -> int:
+    from .cli import _build_app
+
+    _reset_caches()
+    try:
+        _build_app()(args=argv, prog_name="vastcat")
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return exc.code or 0
+        print(exc.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def serve(path: Path = SOCKET_PATH) -> None:
+    """Serve CLI requests on ``path`` until interrupted."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+    # Warm the imports the commands need so the first request is fast too.
+    from . import assets, cli, config, doctor  # noqa: F401
+
+    # Treat ``kill`` like Ctrl-C so the socket is cleaned up either way.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    with socketserver.UnixStreamServer(str(path), _Handler) as server:
+        os.chmod(path, 0o600)
+        print(f"vastcat daemon listening on {path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+
+def forward(argv: List[str], path: Path = SOCKET_PATH) -> Optional[int]:
+    """Run ``argv`` in a running daemon and return its exit code.
+
+    Returns ``None`` when the command must run locally, no daemon is
+    listening, or the daemon was started with a different config, so the
+    caller can fall back to running it in-process.
+    """
+    if "--daemon" in argv or (argv and argv[0] in _LOCAL_COMMANDS):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    with sock, sock.makefile("rb") as replies:
+        env = {name: os.environ.get(name) for name in _FORWARDED_ENV + _PINNED_ENV}
+        sock.sendall(json.dumps({"argv": argv, "cwd": os.getcwd(), "env": env}).encode() + b"\n")
+        for line in replies:
+            frame = json.loads(line)
+            if "local" in frame:
+                return None
+            if "exit" in frame:
+                return frame["exit"]
+            stream = sys.stdout if "out" in frame else sys.stderr
+            try:
+                stream.write(frame.get("out", frame.get("err", "")))
+                stream.flush()
+            except BrokenPipeError:
+                # Reader went away (e.g. ``| head``); silence the flush at exit too.
+                os.dup2(os.open(os.devnull, os.O_WRONLY), stream.fileno())
+                return 1
+    # The daemon went away mid-command.
+    return 1
@@ -2,34 +2,45 @@
 from __future__ import annotations
 
 from pathlib import Path
+from string import Template
 from textwrap import dedent
+import shlex
 from typing import Iterable, List
 
 HASHCAT_URL = "https://hashcat.net/files/hashcat-7.1.2.tar.gz"
 
 
-def render_startup_script(asset_paths: Iterable[Path], install_dir: str = "/opt/hashcat") -> str:
-    files = " ".join(str(path) for path in asset_paths)
-    return dedent(
-        f"""
+_STARTUP_TEMPLATE = Template(
+    dedent(
+        """
         #!/bin/bash
         set -euxo pipefail
         export DEBIAN_FRONTEND=noninteractive
         apt-get update
         apt-get install -y build-essential wget curl p7zip-full git python3 python3-venv jq
-        mkdir -p {install_dir}
+        mkdir -p ${install_dir}
         cd /tmp
-        wget -q {HASHCAT_URL} -O hashcat.tar.gz
+        wget -q ${hashcat_url} -O hashcat.tar.gz
         tar -xzf hashcat.tar.gz
-        rsync -a hashcat-*/* {install_dir}/
-        ln -sf {install_dir}/hashcat /usr/local/bin/hashcat
+        rsync -a hashcat-*/* ${install_dir}/
+        ln -sf ${install_dir}/hashcat /usr/local/bin/hashcat
         mkdir -p /opt/vastcat/assets
         # Placeholder for syncing assets that have been pre-fetched
-        for file in {files}; do
-            echo "$file" >> /opt/vastcat/assets/.manifest
-        done
+        ${manifest}
         echo "Vastcat bootstrap complete"
-        """.strip()
+        """
+    ).strip()
+)
+
+
+def render_startup_script(asset_paths: Iterable[Path], install_dir: str = "/opt/hashcat") -> str:
+    files = " ".join(shlex.quote(str(path)) for path in asset_paths)
+    # A bare printf would still write one empty line, so skip it when there is nothing to record.
+    manifest = f"printf '%s\\n' {files} >> /opt/vastcat/assets/.manifest" if files else ":"
+    return _STARTUP_TEMPLATE.substitute(
+        manifest=manifest,
+        install_dir=install_dir,
+        hashcat_url=HASHCAT_URL,
     )
 
 
@@ -41,6 +52,26 @@ def render_hashcat_command(
     rules: List[str],
     extra_args: str = "--status --status-timer=60",
 ) -> str:
-    words = " ".join(wordlists)
-    rules_flags = " ".join(f"-r {rule}" for rule in rules)
-    return f"hashcat -m {hash_mode} -a {attack_mode} {extra_args} {hash_path} {words} {rules_flags}".strip()
+    parts = ["hashcat", "-m", hash_mode, "-a", attack_mode]
+    if extra_args:
+        parts.append(extra_args)
+    parts.append(hash_path)
+    parts += wordlists
+    for rule in rules:
+        parts += ("-r", rule)
+    return " ".join(parts)
+
+
+def render_hashcat_argv(
+    hash_path: str,
+    hash_mode: str,
+    attack_mode: str,
+    wordlists: List[str],
+    rules: List[str],
+    extra_args: str = "--status --status-timer=60",
+) -> List[str]:
+    """Same arguments as :func:`render_hashcat_command`, as an argv list without the binary."""
+    argv = ["-m", hash_mode, "-a", attack_mode, *shlex.split(extra_args), hash_path, *wordlists]
+    for rule in rules:
+        argv += ["-r", rule]
+    return argv
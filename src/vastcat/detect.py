@@ -1,24 +1,50 @@
 """Hash type detection helpers."""
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import functools
 import logging
+import mmap
+import os
 import re
+import sys
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-try:
-    from name_that_hash import runner as nth_runner
-    NTH_AVAILABLE = True
+try:  # linear-time matching for untrusted hashfile content when google-re2 is installed
+    import re2
 except ImportError:
-    NTH_AVAILABLE = False
-    logger.warning("name-that-hash library not available, using regex fallback")
+    re2 = None
+_compile = re2.compile if re2 is not None else re.compile
 
 
-@dataclass
+@functools.lru_cache(maxsize=1)
+def _nth_runner() -> Optional[Any]:
+    """Import name-that-hash on first use; its import alone costs more than the rest of the CLI."""
+    try:
+        from name_that_hash import runner
+    except ImportError:
+        logger.warning("name-that-hash library not available, using regex fallback")
+        return None
+    return runner
+
+
+def __getattr__(name: str) -> Any:
+    # ``NTH_AVAILABLE`` is probed lazily so importing this module stays cheap.
+    if name == "NTH_AVAILABLE":
+        return _nth_runner() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ``slots`` needs Python 3.10; older interpreters just keep the instance dict.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class HashGuess:
     name: str
     mode: str
@@ -59,6 +85,38 @@ _REGEXES = {
     "1100": re.compile(r"^\{[A-Z0-9]+\}[a-fA-F0-9]{40}$"),  # Domain Cached Credentials (DCC)
 }
 
+
+def _combine(regexes: Dict[str, re.Pattern[str]]) -> Tuple[re.Pattern[str], Tuple[Tuple[str, ...], ...]]:
+    """Fold the per-mode regexes into one anchored alternation.
+
+    Modes sharing a pattern (MD5/LM, NetNTLMv1/v2) share a group, and the
+    distinct patterns never match the same string, so the group that matched
+    names every mode the sample fits.
+    """
+    by_source: Dict[str, List[str]] = {}
+    for mode, pattern in regexes.items():
+        by_source.setdefault(pattern.pattern, []).append(mode)
+    bodies = []
+    for source in by_source:
+        body = source[1:] if source.startswith("^") else source
+        if body.endswith("$") and not body.endswith("\\$"):
+            body = body[:-1]
+        bodies.append(f"({body})")
+    return _compile("|".join(bodies)), tuple(tuple(modes) for modes in by_source.values())
+
+
+# One regex pass per sample instead of one match() per mode.
+_COMBINED, _GROUP_MODES = _combine(_REGEXES)
+
+_HEX_ONLY = _compile(r"[0-9a-fA-F]+")
+# Bare hex digests are the common case and only their length matters, so map
+# length -> modes up front (derived from the regexes so the two can't drift).
+_HEX_LENGTH_MODES: Dict[int, Tuple[str, ...]] = {
+    length: _GROUP_MODES[hit.lastindex - 1]
+    for length in range(1, 257)
+    if (hit := _COMBINED.fullmatch("a" * length))
+}
+
 _NAMED_SPECIALS = {
     "3200": HashGuess("bcrypt", "3200", 0.95, "starts with $2*$"),
     "500": HashGuess("md5crypt", "500", 0.85, "starts with $1$"),
@@ -78,7 +136,8 @@ def detect_hash_modes(sample: str) -> List[HashGuess]:
     """Return best-guess hash modes matching the provided sample.
 
     Uses name-that-hash library when available (300+ hash types).
-    Falls back to regex-based detection if library is not installed.
+    Falls back to regex-based detection if the library is not installed
+    or does not recognise the sample.
     """
     sample = sample.strip()
     if not sample:
@@ -87,30 +146,29 @@ def detect_hash_modes(sample: str) -> List[HashGuess]:
 
     logger.debug(f"Detecting hash type for sample: {sample[:32]}... (length: {len(sample)})")
 
-    # Use name-that-hash if available (much better detection)
-    if NTH_AVAILABLE:
-        results = _detect_with_name_that_hash(sample)
-        if results:
-            logger.info(f"Successfully detected {len(results)} potential hash types")
-        else:
-            logger.warning("No hash types detected by name-that-hash")
-        return results
-
-    # Fallback to regex-based detection
-    logger.debug("Using regex-based detection (name-that-hash not available)")
-    results = _detect_with_regex(sample)
+    results = _best_guesses(sample)
     if results:
-        logger.info(f"Regex detection found {len(results)} potential hash types")
+        logger.info(f"Detected {len(results)} potential hash types")
     else:
-        logger.warning("No hash types detected by regex fallback")
+        logger.warning("No hash types detected")
     return results
 
 
+def _best_guesses(sample: str) -> List[HashGuess]:
+    """Ask name-that-hash when it is installed, and the regex table when it is not or finds nothing."""
+    if _nth_runner() is not None:
+        results = _detect_with_name_that_hash(sample)
+        if results:
+            return results
+        logger.debug("name-that-hash found nothing; trying regex fallback")
+    return _detect_with_regex(sample)
+
+
 def _detect_with_name_that_hash(sample: str) -> List[HashGuess]:
     """Detect hash type using name-that-hash library."""
     try:
         # Use full detection for comprehensive hash type coverage
-        result = nth_runner.api_return_hashes_as_dict([sample], {})
+        result = _nth_runner().api_return_hashes_as_dict([sample], {})
 
         if not result or sample not in result:
             logger.debug(f"name-that-hash returned no results for sample: {sample[:32]}...")
@@ -160,36 +218,29 @@ def _detect_with_regex(sample: str) -> List[HashGuess]:
     Checks more specific formats first (NetNTLM, bcrypt, etc.)
     before falling back to simple hex hashes.
     """
-    matches: List[HashGuess] = []
+    # Keyed by mode, so a format can only be reported once
+    matches: Dict[str, HashGuess] = {}
+    # Bare hex digests need one character-class scan, not the full alternation.
+    hit_modes = _HEX_LENGTH_MODES.get(len(sample), ())
+    if not (hit_modes and _HEX_ONLY.fullmatch(sample)):
+        hit = _COMBINED.fullmatch(sample)
+        hit_modes = _GROUP_MODES[hit.lastindex - 1] if hit else ()
+    if not hit_modes:
+        return []
 
     # Check named/special formats FIRST (more specific)
     for mode, guess in _NAMED_SPECIALS.items():
-        pattern = _REGEXES.get(mode)
-        if pattern and pattern.match(sample):
-            matches.append(guess)
+        if mode in hit_modes:
+            matches.setdefault(mode, guess)
 
     # Then check simple patterns (less specific, many false positives)
     # Only add if not already matched by a named special
-    matched_modes = {g.mode for g in matches}
     for guess in _PATTERNS:
-        if guess.mode in matched_modes:
-            continue
-        pattern = _REGEXES.get(guess.mode)
-        if pattern and pattern.match(sample):
-            matches.append(guess)
+        if guess.mode in hit_modes:
+            matches.setdefault(guess.mode, guess)
 
     # Sort by confidence (highest first)
-    matches.sort(key=lambda g: g.confidence, reverse=True)
-
-    # Remove duplicates while preserving order
-    deduped: List[HashGuess] = []
-    seen = set()
-    for guess in matches:
-        if guess.mode in seen:
-            continue
-        deduped.append(guess)
-        seen.add(guess.mode)
-    return deduped
+    return sorted(matches.values(), key=lambda g: g.confidence, reverse=True)
 
 
 def sample_from_file(path: str) -> Optional[str]:
@@ -200,12 +251,9 @@ def sample_from_file(path: str) -> Optional[str]:
         return None
     try:
         logger.debug(f"Reading hash sample from: {file_path}")
-        with file_path.open("r", encoding="utf-8", errors="ignore") as handle:
-            for line_num, line in enumerate(handle, 1):
-                candidate = _extract_candidate(line)
-                if candidate:
-                    logger.debug(f"Extracted hash sample from line {line_num}: {candidate[:32]}...")
-                    return candidate
+        candidate = _first_candidate(file_path)
+        if candidate:
+            return candidate
         logger.warning(f"No valid hash found in file: {file_path}")
     except OSError as e:
         logger.error(f"Error reading hash file {file_path}: {e}")
@@ -213,8 +261,51 @@ def sample_from_file(path: str) -> Optional[str]:
     return None
 
 
-def _extract_candidate(line: str) -> Optional[str]:
-    """Extract the hash candidate from a line.
+def detect_hash_modes_batch(lines: Iterable[bytes]) -> Counter[str]:
+    """Count the best-guess hashcat mode of every hash in ``lines``.
+
+    ``lines`` are raw bytes (e.g. a file opened in ``"rb"`` mode); only the
+    distinct candidates get decoded. Identical hashes are classified once;
+    entries nothing recognises are counted under ``"unknown"``.
+    """
+    candidates = Counter(filter(None, map(_extract_candidate, lines)))
+    modes: Counter[str] = Counter()
+    for raw, count in candidates.items():
+        guesses = _best_guesses(raw.decode("utf-8", "ignore"))
+        modes[guesses[0].mode if guesses else "unknown"] += count
+    return modes
+
+
+def _first_candidate(file_path: Path) -> Optional[str]:
+    """Return the first usable candidate, decoding only the lines it has to look at.
+
+    The file is memory-mapped so a multi-GB hashlist costs no more than its
+    leading comments and blank lines.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            start, line_num = 0, 0
+            while start < len(mm):
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = len(mm)
+                line_num += 1
+                raw = _extract_candidate(mm[start:end])
+                if raw:
+                    candidate = raw.decode("utf-8", "ignore")
+                    logger.debug(f"Extracted hash sample from line {line_num}: {candidate[:32]}...")
+                    return candidate
+                start = end + 1
+    finally:
+        os.close(fd)
+    return None
+
+
+def _extract_candidate(line: bytes) -> Optional[bytes]:
+    """Extract the hash candidate from a raw line; callers decode only the result.
 
     Handles various formats:
     - Plain hash: 5d41402abc4b2a76b9719d911017c592
@@ -223,30 +314,32 @@ def _extract_candidate(line: str) -> Optional[str]:
     - bcrypt: $2a$10$... ($ delimiters)
     """
     stripped = line.strip()
-    if not stripped or stripped.startswith("#"):
+    if not stripped or stripped.startswith(b"#"):
         return None
 
     # Patterns that indicate the whole line should be used (colons are part of format)
     # NetNTLMv1/v2 pattern: username::domain:challenge:response or similar
-    if "::" in stripped and stripped.count(":") >= 4:
+    if b"::" in stripped and stripped.count(b":") >= 4:
         return stripped
 
     # Hashes starting with $ (bcrypt, sha512crypt, etc.) - use whole line
-    if stripped.startswith("$"):
+    if stripped.startswith(b"$"):
         return stripped
 
     # Hash formats with specific patterns that use colons
     # e.g., sha512crypt: $6$rounds=5000$salt$hash
-    if "$" in stripped:
+    if b"$" in stripped:
         return stripped
 
     # For simple formats, try colon splitting (user:hash)
     # but only if there are few colons (1-2 typically)
-    if ":" in stripped and stripped.count(":") <= 2:
-        fields = [field.strip() for field in stripped.split(":") if field.strip()]
-        if fields:
-            # Return the longest field (usually the hash)
-            return max(fields, key=len)
+    if b":" in stripped and stripped.count(b":") <= 2:
+        # Return the longest field (usually the hash); empty fields never win.
+        # Measure in characters so a non-ASCII username can't outgrow the hash.
+        key = len if stripped.isascii() else (lambda field: len(field.decode("utf-8", "ignore")))
+        longest = max((field.strip() for field in stripped.split(b":")), key=key)
+        if longest:
+            return longest
 
     # Default: return the whole line
     return stripped
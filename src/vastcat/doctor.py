@@ -0,0 +1,95 @@
+"""Cached hashcat and executable lookups shared by the CLI checks."""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .config import ensure_config
+
+LOCAL_HASHCAT = Path.home() / ".local" / "share" / "vastcat" / "hashcat" / "hashcat"
+LOCAL_BIN = Path.home() / ".local" / "bin" / "hashcat"
+
+
+def _cache_path() -> Path:
+    # Lives beside manifest.json and .meta/, so a configured cache_dir moves it too.
+    return ensure_config().cache_dir / "doctor.json"
+
+
+def _cache_key() -> str:
+    return f"{sys.platform}:{os.environ.get('PATH', '')}"
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_which(name: str, path: Optional[str]) -> Optional[str]:
+    return shutil.which(name, path=path)
+
+
+def which(name: str) -> Optional[str]:
+    """``shutil.which`` memoized per ``$PATH`` value."""
+    return _cached_which(name, os.environ.get("PATH"))
+
+
+def clear_which_cache() -> None:
+    _cached_which.cache_clear()
+
+
+# Result of the last lookup in this process, so repeated checks skip the cache file too.
+_found: Optional[str] = None
+
+
+def _is_executable(path: Path) -> bool:
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and bool(st.st_mode & 0o111)
+
+
+def _probe_hashcat() -> Optional[str]:
+    for candidate in (LOCAL_HASHCAT, LOCAL_BIN):
+        if _is_executable(candidate):
+            return str(candidate)
+    return which("hashcat")
+
+
+def find_hashcat(refresh: bool = False) -> Optional[str]:
+    """Return the hashcat binary vastcat should use, or ``None``.
+
+    A successful probe is remembered in ``<cache_dir>/doctor.json`` for the
+    current platform and ``$PATH``, so later invocations only re-check that
+    the cached binary is still executable.
+    """
+    global _found
+    if _found and not refresh:
+        return _found
+    if refresh:
+        clear_which_cache()
+
+    key = _cache_key()
+    if not refresh:
+        try:
+            cached = json.loads(_cache_path().read_text())
+        except (OSError, ValueError):
+            cached = {}
+        path = cached.get("hashcat") if cached.get("key") == key else None
+        if path and os.access(path, os.X_OK):
+            _found = path
+            return path
+
+    path = _found = _probe_hashcat()
+    if path:
+        try:
+            _cache_path().write_text(json.dumps({"key": key, "hashcat": path}))
+        except OSError:
+            pass
+    return path
+
+
+def is_local_install(path: str) -> bool:
+    return path in (str(LOCAL_HASHCAT), str(LOCAL_BIN))
@@ -6,48 +6,50 @@ from typing import List, Optional
 import os
 import shlex
 import shutil
+import signal
 import subprocess
 
+from .doctor import _is_executable, find_hashcat
 from .notifier import Notifier
 
 
-class HashcatRunner:
-    def __init__(self, binary: Optional[str] = None, notifier: Optional[Notifier] = None) -> None:
-        self.binary = binary or self._find_hashcat_binary()
-        self.notifier = notifier or Notifier()
+# Checked after doctor.find_hashcat() (local install, its symlink, then $PATH) comes up empty.
+_FALLBACK_CANDIDATES = (
+    Path("/opt/hashcat/hashcat"),
+    Path("/usr/bin/hashcat"),
+    Path("/usr/local/bin/hashcat"),
+    Path.home() / "hashcat" / "hashcat",
+)
+
+# Python ignores these; Popen's restore_signals resets them in the child, so do the same.
+_RESTORED_SIGNALS = tuple(
+    getattr(signal, name) for name in ("SIGPIPE", "SIGXFSZ") if hasattr(signal, name)
+)
 
-    def _find_hashcat_binary(self) -> str:
-        """Find hashcat binary in PATH or common locations."""
-        # First, check our local installation (installed by setup.py)
-        local_install = Path.home() / ".local" / "share" / "vastcat" / "hashcat" / "hashcat"
-        if local_install.exists() and os.access(local_install, os.X_OK):
-            return str(local_install)
 
-        # Check ~/.local/bin (symlink location)
-        local_bin = Path.home() / ".local" / "bin" / "hashcat"
-        if local_bin.exists() and os.access(local_bin, os.X_OK):
-            return str(local_bin)
+def _find_hashcat_binary() -> str:
+    """Find hashcat binary in PATH or common locations."""
+    override = os.environ.get("HASHCAT_BINARY")
+    if override:
+        # ensure_binary() reports a bad override with the install instructions
+        return override
 
-        # Check if hashcat is in PATH
-        hashcat_path = shutil.which("hashcat")
-        if hashcat_path:
-            return hashcat_path
+    found = find_hashcat()
+    if found:
+        return found
 
-        # Fall back to common installation locations
-        common_paths = [
-            "/opt/hashcat/hashcat",
-            "/usr/bin/hashcat",
-            "/usr/local/bin/hashcat",
-            str(Path.home() / "hashcat" / "hashcat"),
-        ]
+    for path in _FALLBACK_CANDIDATES:
+        if _is_executable(path):
+            return str(path)
 
-        for path_str in common_paths:
-            path = Path(path_str)
-            if path.exists() and os.access(path, os.X_OK):
-                return str(path)
+    # Return default and let ensure_binary() raise the error with instructions
+    return "hashcat"
 
-        # Return default and let ensure_binary() raise the error with instructions
-        return "hashcat"
+
+class HashcatRunner:
+    def __init__(self, binary: Optional[str] = None, notifier: Optional[Notifier] = None) -> None:
+        self.binary = binary or _find_hashcat_binary()
+        self.notifier = notifier or Notifier()
 
     def ensure_binary(self) -> None:
         # If binary is just "hashcat", try to find it in PATH again
@@ -75,13 +77,19 @@ class HashcatRunner:
     def run(self, args: List[str], dry_run: bool = False) -> int:
         self.ensure_binary()
         cmd = [self.binary] + args
-        cmd_display = " ".join(shlex.quote(part) for part in cmd)
         if dry_run:
-            print(f"[dry-run] {cmd_display}")
+            print(f"[dry-run] {shlex.join(cmd)}")
             return 0
-        self.notifier.notify("Hashcat started", cmd_display)
-        process = subprocess.Popen(cmd)
-        code = process.wait()
+        if self.notifier.discord_webhook:
+            # Only quote the command when someone will actually see it
+            self.notifier.notify("Hashcat started", shlex.join(cmd))
+        if hasattr(os, "posix_spawn"):
+            # Straight spawn+exec, skipping Popen's fork-side setup
+            pid = os.posix_spawn(self.binary, cmd, os.environ, setsigdef=_RESTORED_SIGNALS)
+            _, status = os.waitpid(pid, 0)
+            code = os.waitstatus_to_exitcode(status)
+        else:
+            code = subprocess.Popen(cmd).wait()
         status = "completed" if code == 0 else f"failed ({code})"
         self.notifier.notify("Hashcat status", f"Run {status}")
         return code
@@ -1,11 +1,15 @@
 """Automatic hashcat installation module."""
 import os
 import platform
-import shutil
 import subprocess
+import sys
 import tarfile
+import threading
 import urllib.request
 from pathlib import Path
+from typing import Optional, TextIO
+
+from .doctor import which
 
 
 def get_hashcat_install_dir() -> Path:
@@ -16,7 +20,7 @@ def get_hashcat_install_dir() -> Path:
 def check_hashcat_installed() -> bool:
     """Check if hashcat is already installed (system-wide or local)."""
     # Check system PATH
-    if shutil.which("hashcat"):
+    if which("hashcat"):
         return True
 
     # Check our local installation
@@ -32,15 +36,19 @@ def check_hashcat_installed() -> bool:
     return False
 
 
-def download_and_install_hashcat(verbose: bool = True) -> bool:
-    """Download and install hashcat binaries to user-local directory."""
+def download_and_install_hashcat(verbose: bool = True, stream: Optional[TextIO] = None) -> bool:
+    """Download and install hashcat binaries to user-local directory.
+
+    Progress messages go to ``stream`` (stdout by default) when ``verbose`` is set.
+    """
+    out = stream or sys.stdout
     if check_hashcat_installed():
         if verbose:
-            print("\n✓ Hashcat is already installed")
+            print("\n✓ Hashcat is already installed", file=out)
         return True
 
     if verbose:
-        print("\n🔧 Installing hashcat...")
+        print("\n🔧 Installing hashcat...", file=out)
 
     system = platform.system().lower()
     machine = platform.machine().lower()
@@ -54,33 +62,33 @@ def download_and_install_hashcat(verbose: bool = True) -> bool:
             url = f"https://hashcat.net/files/hashcat-{hashcat_version}.tar.gz"
         else:
             if verbose:
-                print(f"⚠️  No pre-built binaries for {machine} architecture")
-                _show_manual_instructions()
+                print(f"⚠️  No pre-built binaries for {machine} architecture", file=out)
+                _show_manual_instructions(out)
             return False
     elif system == "darwin":
         # macOS - use Homebrew or build from source
         if verbose:
-            print("⚠️  macOS detected - attempting Homebrew installation...")
-        if shutil.which("brew"):
+            print("⚠️  macOS detected - attempting Homebrew installation...", file=out)
+        if which("brew"):
             try:
                 subprocess.run(["brew", "install", "hashcat"], check=True)
                 if verbose:
-                    print("✓ Hashcat installed via Homebrew")
+                    print("✓ Hashcat installed via Homebrew", file=out)
                 return True
             except subprocess.CalledProcessError:
                 if verbose:
-                    print("⚠️  Homebrew installation failed")
-                    _show_manual_instructions()
+                    print("⚠️  Homebrew installation failed", file=out)
+                    _show_manual_instructions(out)
                 return False
         else:
             if verbose:
-                print("⚠️  Homebrew not found")
-                _show_manual_instructions()
+                print("⚠️  Homebrew not found", file=out)
+                _show_manual_instructions(out)
             return False
     else:
         if verbose:
-            print(f"⚠️  Unsupported platform: {system}")
-            _show_manual_instructions()
+            print(f"⚠️  Unsupported platform: {system}", file=out)
+            _show_manual_instructions(out)
         return False
 
     # Download hashcat
@@ -91,68 +99,89 @@ def download_and_install_hashcat(verbose: bool = True) -> bool:
 
     try:
         if verbose:
-            print(f"  Downloading hashcat {hashcat_version}...")
-        urllib.request.urlretrieve(url, download_path)
+            print(f"  Downloading hashcat {hashcat_version}...", file=out)
+        _download(url, download_path)
 
         if verbose:
-            print("  Extracting...")
-        with tarfile.open(download_path, "r:gz") as tar:
-            tar.extractall(install_dir)
+            print("  Extracting...", file=out)
+        _extract_tarball(download_path, install_dir)
 
         # Find the extracted directory and compile
         extracted_dir = install_dir / f"hashcat-{hashcat_version}"
 
         if not extracted_dir.exists():
             if verbose:
-                print(f"⚠️  Extraction failed - directory not found: {extracted_dir}")
-                _show_manual_instructions()
+                print(f"⚠️  Extraction failed - directory not found: {extracted_dir}", file=out)
+                _show_manual_instructions(out)
             return False
 
         # Compile hashcat from source
         if verbose:
-            print("  Compiling hashcat (this may take a few minutes)...")
+            print("  Compiling hashcat (this may take a few minutes)...", file=out)
+            features = _cpu_features()
+            if features:
+                print(f"  Tuning for this CPU ({', '.join(features)})", file=out)
         try:
-            result = subprocess.run(
-                ["make", "-j", str(os.cpu_count() or 4)],
+            make_cmd = ["make", "-j", str(os.cpu_count() or 4)]
+            # Compiler diagnostics stream straight through instead of piling up in memory
+            process = subprocess.Popen(
+                make_cmd,
                 cwd=extracted_dir,
-                capture_output=True,
+                env=_native_build_env(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE if verbose else subprocess.DEVNULL,
                 text=True,
-                timeout=300  # 5 minute timeout
             )
-            if result.returncode != 0:
+            timed_out = threading.Event()
+
+            def _kill() -> None:
+                timed_out.set()
+                process.kill()
+
+            timer = threading.Timer(300, _kill)  # 5 minute timeout
+            timer.start()
+            try:
+                if process.stderr is not None:
+                    for line in process.stderr:
+                        out.write(line)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(make_cmd, 300)
+            if returncode != 0:
                 if verbose:
-                    print(f"⚠️  Compilation failed:")
-                    print(result.stderr)
-                    _show_manual_instructions()
+                    print("⚠️  Compilation failed (see errors above)", file=out)
+                    _show_manual_instructions(out)
                 return False
             if verbose:
-                print("  ✓ Compilation successful")
+                print("  ✓ Compilation successful", file=out)
         except subprocess.TimeoutExpired:
             if verbose:
-                print("⚠️  Compilation timed out")
-                _show_manual_instructions()
+                print("⚠️  Compilation timed out", file=out)
+                _show_manual_instructions(out)
             return False
         except FileNotFoundError:
             if verbose:
-                print("⚠️  'make' command not found - build tools not installed")
-                print("  Install build tools first:")
-                print("    Ubuntu/Debian: sudo apt install build-essential")
-                print("    Fedora/RHEL:   sudo dnf groupinstall 'Development Tools'")
-                print("    Arch:          sudo pacman -S base-devel")
-                _show_manual_instructions()
+                print("⚠️  'make' command not found - build tools not installed", file=out)
+                print("  Install build tools first:", file=out)
+                print("    Ubuntu/Debian: sudo apt install build-essential", file=out)
+                print("    Fedora/RHEL:   sudo dnf groupinstall 'Development Tools'", file=out)
+                print("    Arch:          sudo pacman -S base-devel", file=out)
+                _show_manual_instructions(out)
             return False
         except Exception as e:
             if verbose:
-                print(f"⚠️  Compilation error: {e}")
-                _show_manual_instructions()
+                print(f"⚠️  Compilation error: {e}", file=out)
+                _show_manual_instructions(out)
             return False
 
         # Check for compiled binary
         hashcat_binary = extracted_dir / "hashcat"
         if not hashcat_binary.exists():
             if verbose:
-                print(f"⚠️  Compilation succeeded but binary not found in {extracted_dir}")
-                _show_manual_instructions()
+                print(f"⚠️  Compilation succeeded but binary not found in {extracted_dir}", file=out)
+                _show_manual_instructions(out)
             return False
 
         # Make sure binary is executable
@@ -179,47 +208,98 @@ exec "$HASHCAT_DIR/hashcat" "$@"
         if not symlink.exists():
             symlink.symlink_to(wrapper_script)
             if verbose:
-                print(f"\n✓ Hashcat installed to {install_dir}")
-                print(f"✓ Symlink created at {symlink}")
+                print(f"\n✓ Hashcat installed to {install_dir}", file=out)
+                print(f"✓ Symlink created at {symlink}", file=out)
 
             # Check if ~/.local/bin is in PATH
             local_bin_in_path = str(bin_dir) in os.environ.get("PATH", "")
             if not local_bin_in_path:
                 if verbose:
-                    print(f"\n⚠️  Add ~/.local/bin to your PATH:")
-                    print(f"    export PATH=\"$HOME/.local/bin:$PATH\"")
-                    print(f"    (Add this to your ~/.bashrc or ~/.zshrc)")
+                    print(f"\n⚠️  Add ~/.local/bin to your PATH:", file=out)
+                    print(f"    export PATH=\"$HOME/.local/bin:$PATH\"", file=out)
+                    print(f"    (Add this to your ~/.bashrc or ~/.zshrc)", file=out)
         else:
             if verbose:
-                print(f"\n✓ Hashcat installed to {install_dir}")
+                print(f"\n✓ Hashcat installed to {install_dir}", file=out)
 
         return True
 
     except Exception as e:
         if verbose:
-            print(f"\n⚠️  Installation failed: {e}")
-            _show_manual_instructions()
+            print(f"\n⚠️  Installation failed: {e}", file=out)
+            _show_manual_instructions(out)
         return False
 
 
-def _show_manual_instructions():
+def _download(url: str, dest: Path) -> None:
+    """Fetch ``url`` to ``dest``, over parallel connections with aria2c when installed."""
+    aria2c = which("aria2c")
+    if aria2c:
+        result = subprocess.run(
+            [aria2c, "-q", "-x", "8", "-s", "8", "--allow-overwrite=true", "-d", str(dest.parent), "-o", dest.name, url],
+            capture_output=True,
+        )
+        if result.returncode == 0:
+            return
+    urllib.request.urlretrieve(url, dest)
+
+
+def _extract_tarball(archive: Path, dest: Path) -> None:
+    """Unpack a .tar.gz, preferring the system tar (with pigz when present)."""
+    tar_bin = which("tar")
+    if tar_bin:
+        decompress = ["--use-compress-program=pigz"] if which("pigz") else ["-z"]
+        result = subprocess.run([tar_bin, *decompress, "-xf", str(archive), "-C", str(dest)], capture_output=True)
+        if result.returncode == 0:
+            return
+    # Stream mode reads the archive front to back without seeking back for members.
+    with tarfile.open(archive, "r|gz") as tar:
+        tar.extractall(dest)
+
+
+def _native_build_env() -> dict:
+    """Environment for building hashcat's host code for this machine's CPU.
+
+    Passed through the environment rather than on the make command line so
+    hashcat's own ``CFLAGS +=`` additions still apply.
+    """
+    env = dict(os.environ)
+    env["CFLAGS"] = f"{env.get('CFLAGS', '')} -march=native".strip()
+    return env
+
+
+def _cpu_features() -> list:
+    """Vector/hash instruction sets advertised in /proc/cpuinfo, for the install log."""
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("flags"):
+                    flags = set(line.split(":", 1)[1].split())
+                    return [f for f in ("avx2", "avx512f", "sha_ni") if f in flags]
+    except OSError:
+        pass
+    return []
+
+
+def _show_manual_instructions(out: Optional[TextIO] = None):
     """Display manual installation instructions."""
-    print("\n" + "="*70)
-    print("📋 Manual Hashcat Installation Instructions")
-    print("="*70)
-    print("\nUbuntu/Debian:")
-    print("  sudo apt update && sudo apt install -y hashcat")
-    print("\nFedora/RHEL:")
-    print("  sudo dnf install -y hashcat")
-    print("\nArch Linux:")
-    print("  sudo pacman -S hashcat")
-    print("\nmacOS:")
-    print("  brew install hashcat")
-    print("\nFrom Source:")
-    print("  wget https://hashcat.net/files/hashcat-6.2.6.tar.gz")
-    print("  tar -xzf hashcat-6.2.6.tar.gz")
-    print("  cd hashcat-6.2.6 && make && sudo make install")
-    print("\nVerify installation:")
-    print("  hashcat --version")
-    print("  vastcat doctor")
-    print("="*70 + "\n")
+    out = out or sys.stdout
+    print("\n" + "="*70, file=out)
+    print("📋 Manual Hashcat Installation Instructions", file=out)
+    print("="*70, file=out)
+    print("\nUbuntu/Debian:", file=out)
+    print("  sudo apt update && sudo apt install -y hashcat", file=out)
+    print("\nFedora/RHEL:", file=out)
+    print("  sudo dnf install -y hashcat", file=out)
+    print("\nArch Linux:", file=out)
+    print("  sudo pacman -S hashcat", file=out)
+    print("\nmacOS:", file=out)
+    print("  brew install hashcat", file=out)
+    print("\nFrom Source:", file=out)
+    print("  wget https://hashcat.net/files/hashcat-6.2.6.tar.gz", file=out)
+    print("  tar -xzf hashcat-6.2.6.tar.gz", file=out)
+    print("  cd hashcat-6.2.6 && make && sudo make install", file=out)
+    print("\nVerify installation:", file=out)
+    print("  hashcat --version", file=out)
+    print("  vastcat doctor", file=out)
+    print("="*70 + "\n", file=out)
@@ -1,9 +1,30 @@
 """Notification helpers."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-import json
+import atexit
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+
+
+@functools.lru_cache(maxsize=1)
+def _session() -> requests.Session:
+    # One kept-alive connection serves the "started" and "status" posts of a run.
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    # Posts go out in the background so a slow webhook never holds up hashcat;
+    # a single worker shared by every Notifier keeps them in order, and
+    # shutdown flushes them at exit.
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notifier")
+    atexit.register(pool.shutdown)
+    return pool
 
 
 class Notifier:
@@ -13,6 +34,9 @@ class Notifier:
     def notify(self, title: str, message: str) -> None:
         if not self.discord_webhook:
             return
+        _executor().submit(self._post, title, message)
+
+    def _post(self, title: str, message: str) -> None:
         payload = {
             "username": "Vastcat",
             "embeds": [
@@ -24,7 +48,7 @@ class Notifier:
             ],
         }
         try:
-            resp = requests.post(self.discord_webhook, data=json.dumps(payload), headers={"Content-Type": "application/json"}, timeout=10)
+            resp = _session().post(self.discord_webhook, json=payload, timeout=10)
             resp.raise_for_status()
         except Exception:
             pass  # Silent fail for notifications
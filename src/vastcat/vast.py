@@ -1,10 +1,21 @@
 """Lightweight Vast.ai API client."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from .config import ensure_config
 
@@ -13,6 +24,12 @@ class VastError(RuntimeError):
     pass
 
 
+# Offer listings can run to hundreds of KB; orjson parses them ~3x faster than json.
+_loads = orjson.loads if orjson is not None else json.loads
+
+_OFFER_FIELDS = itemgetter("id", "gpu_name", "dph_total", "gpu_ram", "reliability2", "machine_id")
+
+
 @dataclass
 class Offer:
     id: int
@@ -24,6 +41,15 @@ class Offer:
 
     @classmethod
     def from_api(cls, payload: Dict[str, Any]) -> "Offer":
+        try:
+            id_, gpu_name, hourly, vram_gb, reliability, machine_id = _OFFER_FIELDS(payload)
+        except KeyError:
+            # Rows missing optional fields take the slow path with defaults.
+            return cls._from_partial(payload)
+        return cls(int(id_), gpu_name, float(hourly), float(vram_gb), float(reliability), int(machine_id))
+
+    @classmethod
+    def _from_partial(cls, payload: Dict[str, Any]) -> "Offer":
         return cls(
             id=int(payload["id"]),
             gpu_name=payload.get("gpu_name", ""),
@@ -41,23 +67,49 @@ class VastClient:
         if not self.api_key:
             raise VastError("Missing Vast.ai API key. Set VAST_API_KEY or pass --api-key.")
         self.api_url = api_url or cfg.get("vast_api_url")
+        # (min_vram, limit) -> (monotonic fetch time, offers); spares the API when the wizard re-asks.
+        self._offers_cache: Dict[Tuple[int, int], Tuple[float, List[Offer]]] = {}
+        self._offers_ttl = float(cfg.get("offers_cache_ttl", 30))
+        # One pooled session keeps the TLS connection to the API alive across calls.
+        # Only GETs are retried: re-sending a contract POST could rent a second instance.
+        self._session = requests.Session()
+        self._session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
-    def _headers(self) -> Dict[str, str]:
-        return {"Authorization": f"Bearer {self.api_key}"}
+    def close(self) -> None:
+        self._session.close()
+
+    def invalidate_offers(self) -> None:
+        self._offers_cache.clear()
 
     def _url(self, path: str) -> str:
         return f"{self.api_url.rstrip('/')}{path}"
 
     def list_offers(self, min_vram: int = 12, limit: int = 10) -> List[Offer]:
+        key = (min_vram, limit)
+        cached = self._offers_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self._offers_ttl:
+            return list(cached[1])
         params = {
             "q": f"verified=true gpu_ram>={min_vram} reliability2>0.9",
             "limit": limit,
         }
-        resp = requests.get(self._url("/market/asks"), params=params, headers=self._headers(), timeout=20)
+        resp = self._session.get(self._url("/market/asks"), params=params, timeout=20)
         if resp.status_code != 200:
             raise VastError(f"Unable to fetch offers: {resp.text}")
-        offers_json = resp.json().get("offers", [])
-        return [Offer.from_api(item) for item in offers_json]
+        offers_json = _loads(resp.content).get("offers", [])
+        offers = list(map(Offer.from_api, offers_json))
+        self._offers_cache[key] = (time.monotonic(), offers)
+        return list(offers)
 
     def create_instance(
         self,
@@ -77,14 +129,25 @@ class VastClient:
         }
         if onstart:
             payload["onstart"] = onstart
-        resp = requests.post(self._url("/market/contracts"), json=payload, headers=self._headers(), timeout=20)
+        resp = self._session.post(self._url("/market/contracts"), json=payload, timeout=20)
         if resp.status_code >= 400:
             raise VastError(f"Unable to create instance: {resp.text}")
-        return resp.json()
+        # The rented offer is gone from the market now.
+        self.invalidate_offers()
+        return _loads(resp.content)
 
     def run_command(self, instance_id: int, command: str) -> Dict[str, Any]:
         payload = {"instance_id": instance_id, "cmd": command}
-        resp = requests.post(self._url("/container/spawn"), json=payload, headers=self._headers(), timeout=20)
+        resp = self._session.post(self._url("/container/spawn"), json=payload, timeout=20)
         if resp.status_code >= 400:
             raise VastError(f"Command failed: {resp.text}")
-        return resp.json()
+        return _loads(resp.content)
+
+    def run_commands(self, commands: Iterable[Tuple[int, str]]) -> List[Dict[str, Any]]:
+        """Spawn ``(instance_id, command)`` pairs concurrently, returning results in order."""
+        commands = list(commands)
+        if len(commands) <= 1:
+            return [self.run_command(instance_id, command) for instance_id, command in commands]
+        # Bounded by the adapter's pool so each request gets its own kept-alive connection.
+        with ThreadPoolExecutor(max_workers=min(len(commands), 16)) as pool:
+            return list(pool.map(lambda pair: self.run_command(*pair), commands))
@@ -2,22 +2,29 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
+import functools
 import os
-import shlex
-
-from rich.console import Console
-import questionary
-from questionary import Choice
 
 from .assets import ASSET_LIBRARY, AssetManager, list_assets
 from .config import ensure_config
-from .deployment import render_hashcat_command, render_startup_script
 from .detect import HashGuess, detect_hash_modes, sample_from_file
-from .hashcat import HashcatRunner
-from .notifier import Notifier
 from .theme import CAT_ASCII, cat_say
 
+# rich and questionary (prompt_toolkit) are imported where they are used, so
+# importing this module stays cheap for callers that never prompt.
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from rich.console import Console
+
+
+@functools.lru_cache(maxsize=1)
+def _questionary() -> ModuleType:
+    import questionary
+
+    return questionary
+
 
 ATTACK_MODES = {
     "Straight (mode 0)": "0",
@@ -29,7 +36,11 @@ ATTACK_MODES = {
 
 class Wizard:
     def __init__(self, console: Optional[Console] = None) -> None:
-        self.console = console or Console()
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
+        self.console = console
         self.config = ensure_config()
         self.asset_manager = AssetManager(self.config)
 
@@ -46,7 +57,7 @@ class Wizard:
         while True:
             self._show_configuration_summary(config)
 
-            action = questionary.select(
+            action = _questionary().select(
                 "What would you like to do?",
                 choices=[
                     "Proceed with these settings",
@@ -109,17 +120,18 @@ class Wizard:
 
     def _step_select_wordlists(self, config: dict, can_go_back: bool) -> str:
         """Step 1: Select wordlists."""
-        wordlist_keys = self._pick_assets_with_back("wordlists", can_go_back)
+        while True:
+            wordlist_keys = self._pick_assets_with_back("wordlists", can_go_back)
+
+            if wordlist_keys == "back":
+                return "back"
+            elif wordlist_keys == "cancel":
+                return "cancel"
+            elif wordlist_keys:
+                break
 
-        if wordlist_keys == "back":
-            return "back"
-        elif wordlist_keys == "cancel":
-            return "cancel"
-        elif not wordlist_keys:
             self.console.print(cat_say("No wordlists selected. Hashcat requires at least one wordlist."))
-            if questionary.confirm("Try again?", default=True).ask():
-                return self._step_select_wordlists(config, can_go_back)
-            else:
+            if not _questionary().confirm("Try again?", default=True).ask():
                 return "cancel"
 
         self.asset_manager.sync(wordlist_keys)
@@ -164,7 +176,7 @@ class Wizard:
 
         while True:
             prompt_text = "Path to your hash file (or 'back' to go back)"
-            hash_path = questionary.text(prompt_text, default=default_hash_path).ask()
+            hash_path = _questionary().text(prompt_text, default=default_hash_path).ask()
 
             if hash_path and hash_path.lower() == "back" and can_go_back:
                 return "back"
@@ -172,17 +184,19 @@ class Wizard:
             expanded_path = Path(hash_path).expanduser()
             if expanded_path.exists():
                 config['hash_path'] = hash_path
+                # Later steps and hashcat itself use the expanded path, so expand it only once.
+                config['hash_path_resolved'] = str(expanded_path)
                 return "next"
 
             self.console.print(cat_say(f"File not found: {expanded_path}. Please try again."))
-            if not questionary.confirm("Try another path?", default=True).ask():
-                if can_go_back and questionary.confirm("Go back to previous step?", default=False).ask():
+            if not _questionary().confirm("Try another path?", default=True).ask():
+                if can_go_back and _questionary().confirm("Go back to previous step?", default=False).ask():
                     return "back"
                 return "cancel"
 
     def _step_determine_hash_mode(self, config: dict, can_go_back: bool) -> str:
         """Step 5: Determine hash mode."""
-        hash_mode = self._determine_hash_mode_with_back(config['hash_path'], can_go_back)
+        hash_mode = self._determine_hash_mode_with_back(config['hash_path_resolved'], can_go_back)
 
         if hash_mode == "back":
             return "back"
@@ -198,7 +212,7 @@ class Wizard:
         if can_go_back:
             choices.append("← Go back")
 
-        attack_choice = questionary.select("Choose attack mode", choices=choices).ask()
+        attack_choice = _questionary().select("Choose attack mode", choices=choices).ask()
 
         if attack_choice == "← Go back":
             return "back"
@@ -236,7 +250,7 @@ class Wizard:
 
         self.console.print(f"[dim]Examples: {examples}[/dim]")
 
-        selection = questionary.text(
+        selection = _questionary().text(
             f"Select {category}",
             default="all" if category == "wordlists" else ""
         ).ask()
@@ -269,7 +283,7 @@ class Wizard:
         """Prompt for Discord webhook with back navigation support."""
         default = self.config.get("discord_webhook")
         prompt_text = "Discord webhook (optional, or 'back' to go back)" if can_go_back else "Discord webhook (optional)"
-        webhook = questionary.text(prompt_text, default=default or "").ask()
+        webhook = _questionary().text(prompt_text, default=default or "").ask()
 
         if webhook and webhook.lower() == "back" and can_go_back:
             return "back"
@@ -293,18 +307,18 @@ class Wizard:
 
         self.console.print(cat_say(f"Sample hash snippet: {sample[:24]}..."))
         choices = [
-            Choice(
+            _questionary().Choice(
                 title=f"{guess.name} (mode {guess.mode}) — {guess.reason}",
                 value=guess.mode,
             )
             for guess in guesses
         ]
-        choices.append(Choice(title="Enter manually", value="__manual__"))
+        choices.append(_questionary().Choice(title="Enter manually", value="__manual__"))
 
         if can_go_back:
-            choices.append(Choice(title="← Go back", value="__back__"))
+            choices.append(_questionary().Choice(title="← Go back", value="__back__"))
 
-        selection = questionary.select(
+        selection = _questionary().select(
             "Detected hash types (confirm or pick manually)",
             choices=choices,
         ).ask()
@@ -347,19 +361,20 @@ class Wizard:
             "Back to summary"
         ]
 
-        choice = questionary.select("Which parameter would you like to edit?", choices=edit_choices).ask()
+        choice = _questionary().select("Which parameter would you like to edit?", choices=edit_choices).ask()
 
         if choice == "Back to summary":
             return False
         elif choice.startswith("1"):
             # Edit hash file
             while True:
-                hash_path = questionary.text("Path to your hash file", default=config['hash_path']).ask()
+                hash_path = _questionary().text("Path to your hash file", default=config['hash_path']).ask()
                 expanded_path = Path(hash_path).expanduser()
                 if expanded_path.exists():
                     config['hash_path'] = hash_path
+                    config['hash_path_resolved'] = str(expanded_path)
                     # Re-detect hash mode
-                    config['hash_mode'] = self._determine_hash_mode(hash_path)
+                    config['hash_mode'] = self._determine_hash_mode(config['hash_path_resolved'])
                     break
                 self.console.print(cat_say(f"File not found: {expanded_path}. Please try again."))
         elif choice.startswith("2"):
@@ -367,7 +382,7 @@ class Wizard:
             config['hash_mode'] = self._manual_hash_mode(default=config['hash_mode'])
         elif choice.startswith("3"):
             # Edit attack mode
-            attack_choice = questionary.select("Choose attack mode", choices=list(ATTACK_MODES.keys()),
+            attack_choice = _questionary().select("Choose attack mode", choices=list(ATTACK_MODES.keys()),
                                              default=config['attack_choice']).ask()
             config['attack_mode'] = ATTACK_MODES[attack_choice]
             config['attack_choice'] = attack_choice
@@ -390,35 +405,40 @@ class Wizard:
 
     def _execute_configuration(self, config: dict) -> None:
         """Execute hashcat with the configured parameters."""
+        from .deployment import render_hashcat_argv, render_hashcat_command, render_startup_script
+        from .hashcat import HashcatRunner
+        from .notifier import Notifier
+
         wordlist_paths = self.asset_manager.resolved_paths(config['wordlist_keys'])
         rule_paths = self.asset_manager.resolved_paths(config['rule_keys'])
         notifier = Notifier(config['webhook'])
 
-        command = render_hashcat_command(
-            hash_path=config['hash_path'],
+        hashcat_args = dict(
+            hash_path=config['hash_path_resolved'],
             hash_mode=config['hash_mode'],
             attack_mode=config['attack_mode'],
             wordlists=self._only_files(wordlist_paths, "wordlist"),
             rules=self._only_files(rule_paths, "rule"),
         )
+        command = render_hashcat_command(**hashcat_args)
         script = render_startup_script(wordlist_paths + rule_paths)
 
         self.console.rule(cat_say("Hashcat Command"))
         self.console.print(f"\n[bold]Command:[/bold]\n[italic]{command}[/italic]")
 
-        if questionary.confirm("Save startup script to file?", default=True).ask():
-            path = Path(questionary.text("Path to save script", default="vastcat-startup.sh").ask())
+        if _questionary().confirm("Save startup script to file?", default=True).ask():
+            path = Path(_questionary().text("Path to save script", default="vastcat-startup.sh").ask())
             path.write_text(script)
             os.chmod(path, 0o750)
             self.console.print(cat_say(f"Script written to {path}"))
 
         self.console.print(cat_say("Ready to run hashcat."))
-        if questionary.confirm("Run hashcat locally now?", default=False).ask():
+        if _questionary().confirm("Run hashcat locally now?", default=False).ask():
             hashcat_binary = os.environ.get("HASHCAT_BINARY")
             runner = HashcatRunner(binary=hashcat_binary, notifier=notifier)
             try:
                 runner.ensure_binary()
-                runner.run(shlex.split(command)[1:])
+                runner.run(render_hashcat_argv(**hashcat_args))
             except FileNotFoundError as exc:
                 self.console.print(f"[red]{exc}[/red]")
             except PermissionError as exc:
@@ -449,7 +469,7 @@ class Wizard:
         else:
             self.console.print("[dim]Examples: '1' (single), '1,2' (multiple), '1-3' (range), 'all' (select all)[/dim]")
 
-        selection = questionary.text(
+        selection = _questionary().text(
             f"Select {category}",
             default="all" if category == "wordlists" else ""
         ).ask()
@@ -525,7 +545,7 @@ class Wizard:
 
     def _prompt_discord(self) -> Optional[str]:
         default = self.config.get("discord_webhook")
-        webhook = questionary.text("Discord webhook (optional)", default=default or "").ask()
+        webhook = _questionary().text("Discord webhook (optional)", default=default or "").ask()
         if webhook:
             self.config.set("discord_webhook", webhook)
         return webhook
@@ -550,14 +570,14 @@ class Wizard:
             return self._manual_hash_mode()
         self.console.print(cat_say(f"Sample hash snippet: {sample[:24]}..."))
         choices = [
-            Choice(
+            _questionary().Choice(
                 title=f"{guess.name} (mode {guess.mode}) — {guess.reason}",
                 value=guess.mode,
             )
             for guess in guesses
         ]
-        choices.append(Choice(title="Enter manually", value="__manual__"))
-        selection = questionary.select(
+        choices.append(_questionary().Choice(title="Enter manually", value="__manual__"))
+        selection = _questionary().select(
             "Detected hash types (confirm or pick manually)",
             choices=choices,
         ).ask()
@@ -569,7 +589,7 @@ class Wizard:
         return selection
 
     def _manual_hash_mode(self, default: str = "0") -> str:
-        return questionary.text("Hashcat hash mode", default=default).ask()
+        return _questionary().text("Hashcat hash mode", default=default).ask()
 
     def _guess_from_mode(self, guesses: List[HashGuess], mode: str) -> Optional[HashGuess]:
         for guess in guesses:
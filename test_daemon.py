@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Test forwarding CLI commands to a running daemon."""
+
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, '/opt/vastcat')
+
+tmp = Path(tempfile.mkdtemp(prefix="vastcat-daemon-"))
+config_path = tmp / "config.yaml"
+socket_path = tmp / "daemon.sock"
+env = dict(os.environ, VASTCAT_CONFIG=str(config_path), VASTCAT_CACHE=str(tmp / "cache"))
+os.environ.update(env)
+
+from src.vastcat.daemon import forward
+
+
+def run(argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+        code = forward(argv, socket_path)
+    return code, out.getvalue()
+
+
+server = subprocess.Popen(
+    [sys.executable, "-c", f"from src.vastcat.daemon import serve; from pathlib import Path; serve(Path({str(socket_path)!r}))"],
+    env=env,
+    stdout=subprocess.PIPE,
+    text=True,
+)
+
+print("=== Testing daemon round-trip ===\n")
+
+passed = 0
+failed = 0
+
+
+def check(description, ok, detail=""):
+    global passed, failed
+    if ok:
+        print(f"✓ {description}")
+        passed += 1
+    else:
+        print(f"✗ {description} {detail}")
+        failed += 1
+
+
+try:
+    ready = server.stdout.readline()
+    check("Daemon starts listening", "listening" in ready, repr(ready))
+
+    code, out = run(["install-hashcat"])
+    check("Command output is relayed", code == 0 and "Hashcat Installation Instructions" in out, repr(out[:80]))
+
+    check("Local-only commands are not forwarded", forward(["wizard"], socket_path) is None)
+    check("--daemon is never forwarded", forward(["--daemon"], socket_path) is None)
+
+    # The caller's PATH decides which hashcat the daemon finds.
+    bin_dir = tmp / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "hashcat"
+    fake.write_text("#!/bin/sh\necho v0.0.0-fake\n")
+    fake.chmod(0o755)
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{env['PATH']}"
+    code, out = run(["doctor"])
+    os.environ["PATH"] = env["PATH"]
+    check("Caller's PATH is used for the request", code == 0 and "v0.0.0-fake" in out, repr(out[:200]))
+    code, out = run(["doctor"])
+    check("Daemon's own PATH is restored afterwards", code == 0 and "v0.0.0-fake" not in out, repr(out[:200]))
+
+    os.environ["VASTCAT_CONFIG"] = str(tmp / "other.yaml")
+    check("A different config path runs locally", forward(["doctor"], socket_path) is None)
+    os.environ["VASTCAT_CONFIG"] = env["VASTCAT_CONFIG"]
+
+    code, out = run(["assets", "list", "--category", "rules"])
+    check("First config is used", code == 0 and str(tmp / "cache") in out, repr(out[:120]))
+
+    config_path.write_text(f"cache_dir: {tmp / 'moved'}\n")
+    code, out = run(["assets", "list", "--category", "rules"])
+    check("Edited config is picked up without a restart", code == 0 and str(tmp / "moved") in out, repr(out[:120]))
+    check("Cache directory is created for the new config", (tmp / "moved" / "rules").is_dir())
+
+    code, out = run(["no-such-command"])
+    check("Exit code is relayed", code == 2, repr(code))
+finally:
+    server.terminate()
+    server.wait(timeout=10)
+
+check("Socket is removed on shutdown", not socket_path.exists())
+shutil.rmtree(tmp, ignore_errors=True)
+
+print(f"\n{'='*70}")
+print(f"Results: {passed} passed, {failed} failed")
+print(f"{'='*70}")
+
+sys.exit(0 if failed == 0 else 1)
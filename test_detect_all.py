@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Test whole-hashlist detection (vastcat detect-all)."""
+
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, '/opt/vastcat')
+
+from typer.testing import CliRunner
+
+from src.vastcat.cli import _build_app
+from src.vastcat.detect import detect_hash_modes, detect_hash_modes_batch
+
+MD5 = "5f4dcc3b5aa765d61d8327deb882cf99"
+SHA1 = "356a192b7913b04c54574d18c28d46e6395428ab"
+KERBEROS = "$krb5tgs$23$*user$DOMAIN.COM$service/host*$abc"
+
+hashlist = [
+    "# exported hashes",
+    MD5,
+    "",
+    MD5,
+    f"alice:{MD5}",
+    SHA1,
+    KERBEROS,
+    "not a hash at all",
+]
+
+print("=== Testing detect-all ===\n")
+
+passed = 0
+failed = 0
+
+
+def check(description, ok, detail=""):
+    global passed, failed
+    if ok:
+        print(f"✓ {description}")
+        passed += 1
+    else:
+        print(f"✗ {description} {detail}")
+        failed += 1
+
+
+counts = detect_hash_modes_batch(line.encode() for line in hashlist)
+check("Batch returns a Counter", isinstance(counts, Counter), type(counts).__name__)
+check("Duplicates and user:hash lines are counted", counts["0"] == 3, dict(counts))
+check("Each distinct hash is classified", counts["100"] == 1 and counts["13100"] == 1, dict(counts))
+check("Unrecognised entries are counted as unknown", counts["unknown"] == 1, dict(counts))
+check("Comments and blank lines are skipped", sum(counts.values()) == 6, dict(counts))
+
+for sample in (MD5, SHA1, KERBEROS):
+    single = detect_hash_modes(sample)
+    batch = detect_hash_modes_batch([sample.encode()])
+    expected = single[0].mode if single else "unknown"
+    check(f"Batch agrees with single-hash detection for {sample[:16]}", batch == Counter({expected: 1}), dict(batch))
+
+with tempfile.TemporaryDirectory() as tmp:
+    hash_file = Path(tmp) / "hashes.txt"
+    hash_file.write_text("\n".join(hashlist) + "\n")
+    result = CliRunner().invoke(_build_app(), ["detect-all", str(hash_file)])
+    lines = result.output.splitlines()
+    check("CLI exits cleanly", result.exit_code == 0, result.output)
+    check("CLI lists the most common mode first", lines[:1] == ["0: 3"], lines)
+    check("CLI lists every mode", sorted(lines) == sorted(f"{mode}: {n}" for mode, n in counts.items()), lines)
+
+    result = CliRunner().invoke(_build_app(), ["detect-all", str(Path(tmp) / "missing.txt")])
+    check("CLI reports unreadable files", result.exit_code == 1 and "Cannot read" in result.output, result.output)
+
+print(f"\n{'='*70}")
+print(f"Results: {passed} passed, {failed} failed")
+print(f"{'='*70}")
+
+sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Test asset downloads: resume, conditional GET, range fetches and staged publish."""
+
+import gzip
+import hashlib
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, '/opt/vastcat')
+
+tmp = Path(tempfile.mkdtemp(prefix="vastcat-downloads-"))
+os.environ["VASTCAT_CONFIG"] = str(tmp / "config.yaml")
+
+import requests
+
+from src.vastcat import assets
+from src.vastcat.assets import Asset, AssetManager
+from src.vastcat.config import Config
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves ``files`` with ETags, HEAD and single byte-range support."""
+
+    protocol_version = "HTTP/1.1"
+    files = {}  # path -> (body, etag, accepts ranges)
+    requests = []  # (method, path, Range, If-Range, If-None-Match)
+    no_head = set()
+    truncate = set()  # paths whose next full response is cut off halfway
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        if self.path in self.no_head:
+            self.send_response(405)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        body, etag, ranges = self.files[self.path]
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        self.requests.append((self.command, self.path, range_header, if_range, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304, b"", etag, ranges, send_body)
+        if range_header and ranges and if_range in (None, etag):
+            start, _, end = range_header[len("bytes="):].partition("-")
+            start = int(start)
+            if start >= len(body):
+                return self._reply(416, b"", etag, ranges, send_body, {"Content-Range": f"bytes */{len(body)}"})
+            end = min(int(end) if end else len(body) - 1, len(body) - 1)
+            extra = {"Content-Range": f"bytes {start}-{end}/{len(body)}"}
+            return self._reply(206, body[start:end + 1], etag, ranges, send_body, extra)
+        self._reply(200, body, etag, ranges, send_body)
+
+    def _reply(self, status, body, etag, ranges, send_body, extra=None):
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        if ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body and status == 200 and self.path in self.truncate:
+            self.truncate.discard(self.path)
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+        elif send_body:
+            self.wfile.write(body)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_address[1]}"
+
+manager = AssetManager(Config({"cache_dir": str(tmp / "cache")}))
+
+
+def serve(path, body, etag='"v1"', ranges=True):
+    Handler.files[path] = (body, etag, ranges)
+    return f"{base}{path}"
+
+
+def gets(path):
+    return [req for req in Handler.requests if req[0] == "GET" and req[1] == path]
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+print("=== Testing asset downloads ===\n")
+
+passed = 0
+failed = 0
+
+
+def check(description, ok, detail=""):
+    global passed, failed
+    if ok:
+        print(f"✓ {description}")
+        passed += 1
+    else:
+        print(f"✗ {description} {detail}")
+        failed += 1
+
+
+try:
+    # Plain download, then an unchanged re-fetch answered with 304.
+    body = os.urandom(200_000)
+    asset = Asset(name="plain", category="wordlists", url=serve("/plain.txt", body), checksum=sha256(body))
+    path = manager._download(asset)
+    check("Streams the asset into place", path.read_bytes() == body)
+    check("Leaves no .part file behind", not path.with_name("plain.txt.part").exists())
+    mtime = path.stat().st_mtime_ns
+    path = manager._download(asset)
+    last = [req for req in Handler.requests if req[1] == "/plain.txt"][-1]
+    check("Sends the saved ETag on re-download", last[4] == '"v1"', last)
+    check("Does not fetch the body again on 304", len(gets("/plain.txt")) == 1, gets("/plain.txt"))
+    check("Keeps the file untouched on 304", path.stat().st_mtime_ns == mtime and path.read_bytes() == body)
+
+    body = os.urandom(20_000)
+    Handler.no_head.add("/plain-get.txt")
+    asset = Asset(name="plain-get", category="wordlists", url=serve("/plain-get.txt", body, ranges=False))
+    path = manager._download(asset)
+    manager._download(asset)
+    check("Answers a conditional GET with 304 too", [req[4] for req in gets("/plain-get.txt")] == [None, '"v1"'], gets("/plain-get.txt"))
+
+    # Interrupted download: the .part holds a prefix and the meta records its ETag.
+    body = os.urandom(300_000)
+    asset = Asset(name="resume", category="wordlists", url=serve("/resume.txt", body), checksum=sha256(body))
+    target = manager._download_target(asset)
+    part = target.with_name("resume.txt.part")
+    part.write_bytes(body[:100_000])
+    manager._save_partial_meta(target, {}, {"etag": '"v1"'})
+    path = manager._download(asset)
+    check("Resumes from the partial file with a Range request", gets("/resume.txt")[-1][2:4] == ("bytes=100000-", '"v1"'))
+    check("Resumed file matches and passes its checksum", path.read_bytes() == body)
+
+    # Upstream changed since the partial was written: If-Range fails, full body comes back.
+    body = os.urandom(150_000)
+    asset = Asset(name="changed", category="wordlists", url=serve("/changed.txt", body, etag='"v2"'), checksum=sha256(body))
+    target = manager._download_target(asset)
+    target.with_name("changed.txt.part").write_bytes(os.urandom(50_000))
+    manager._save_partial_meta(target, {}, {"etag": '"v1"'})
+    path = manager._download(asset)
+    check("Restarts when the upstream file changed", path.read_bytes() == body)
+
+    # A partial longer than the file draws a 416: discard it and start over.
+    body = os.urandom(80_000)
+    asset = Asset(name="stale", category="wordlists", url=serve("/stale.txt", body), checksum=sha256(body))
+    target = manager._download_target(asset)
+    target.with_name("stale.txt.part").write_bytes(os.urandom(120_000))
+    manager._save_partial_meta(target, {}, {"etag": '"v1"'})
+    path = manager._download(asset)
+    ranges = [req[2] for req in gets("/stale.txt")]
+    check("Retries without Range after a 416", ranges == ["bytes=120000-", None], ranges)
+    check("Restarted file matches", path.read_bytes() == body)
+
+    # Upstream moves to v2 and the v2 download is cut off: the next sync must
+    # neither trust v2's ETag for the old output nor lose the partial.
+    v1 = os.urandom(150_000)
+    asset = Asset(name="moved", category="wordlists", url=serve("/moved.txt", v1, etag='"v1"'))
+    path = manager._download(asset)
+    v2 = os.urandom(150_000)
+    serve("/moved.txt", v2, etag='"v2"')
+    Handler.truncate.add("/moved.txt")
+    assets.CHUNK_SIZE = 16 * 1024  # small enough that the cut-off leaves a partial
+    try:
+        manager._download(asset)
+        check("Interrupted download raises a requests error", False, "no error raised")
+    except requests.RequestException:
+        check("Interrupted download raises a requests error", True)
+    except Exception as exc:
+        check("Interrupted download raises a requests error", False, repr(exc))
+    assets.CHUNK_SIZE = 8 * 1024 * 1024
+    check("Keeps the v1 output while v2 is incomplete", path.read_bytes() == v1)
+    path = manager._download(asset)
+    last = gets("/moved.txt")[-1]
+    check("Revalidates the output against its own ETag", last[4] == '"v1"', gets("/moved.txt"))
+    check("Resumes the partial against the partial's ETag", last[2] == "bytes=65536-" and last[3] == '"v2"', last)
+    check("Publishes v2 after resuming", path.read_bytes() == v2)
+    manager._download(asset)
+    check("Stores v2's ETag once v2 is in place", Handler.requests[-1][4] == '"v2"', Handler.requests[-1])
+
+    # Checksum mismatch removes the partial download.
+    body = os.urandom(10_000)
+    asset = Asset(name="bad", category="wordlists", url=serve("/bad.txt", body), checksum="0" * 64)
+    try:
+        manager._download(asset)
+        check("Rejects a checksum mismatch", False, "no error raised")
+    except ValueError:
+        target = manager._download_target(asset)
+        check("Rejects a checksum mismatch", not target.exists() and not target.with_name("bad.txt.part").exists())
+
+    # Large files are fetched over parallel ranges when the server allows it.
+    assets.RANGE_MIN_SIZE = 64 * 1024
+    body = os.urandom(1_000_003)
+    asset = Asset(name="ranged", category="wordlists", url=serve("/ranged.txt", body), checksum=sha256(body))
+    path = manager._download(asset)
+    ranges = sorted(req[2] for req in gets("/ranged.txt"))
+    check("Splits a large file into range requests", len(ranges) == assets.RANGE_SEGMENTS, ranges)
+    check("Reassembles the ranged file", path.read_bytes() == body)
+    check("Leaves no .ranged.part file behind", not path.with_name("ranged.txt.ranged.part").exists())
+
+    body = os.urandom(200_000)
+    asset = Asset(name="noranges", category="wordlists", url=serve("/noranges.txt", body, ranges=False), checksum=sha256(body))
+    path = manager._download(asset)
+    check("Falls back to one stream without Accept-Ranges", path.read_bytes() == body and len(gets("/noranges.txt")) == 1)
+    assets.RANGE_MIN_SIZE = 32 * 1024 * 1024
+
+    # gz assets are decompressed on the fly into a staged .tmp and renamed into place.
+    plain = b"password\n" * 20_000
+    packed = gzip.compress(plain)
+    asset = Asset(
+        name="packed", category="wordlists", url=serve("/packed.txt.gz", packed),
+        checksum=sha256(packed), decompress="gz", output_name="packed.txt",
+    )
+    path = manager._download(asset)
+    check("Publishes the decompressed output", path.name == "packed.txt" and path.read_bytes() == plain)
+    check("Removes the staging file", not path.with_name("packed.txt.tmp").exists())
+
+    serve("/packed.txt.gz", packed[: len(packed) // 2], etag='"v2"')
+    asset = Asset(name="packed", category="wordlists", url=f"{base}/packed.txt.gz", decompress="gz", output_name="packed.txt")
+    try:
+        manager._download(asset)
+        check("Rejects a truncated gz stream", False, "no error raised")
+    except ValueError:
+        check("Rejects a truncated gz stream", True)
+    check("Keeps the previous output when an update fails", path.read_bytes() == plain)
+    check("Cleans up the failed staging file", not path.with_name("packed.txt.tmp").exists())
+
+    # Archives downloaded to disk are unpacked into a staged directory and swapped in.
+    tar_dir = tmp / "tar-src"
+    (tar_dir / "rules").mkdir(parents=True)
+    (tar_dir / "rules" / "best64.rule").write_text(":\nc\n")
+    archive = tmp / "rules.tar"
+    with tarfile.open(archive, "w") as tf:
+        tf.add(tar_dir / "rules", arcname="rules")
+    temp = manager._download_target(Asset(name="r", category="rules", url=f"{base}/r.tar")).with_name("r.tar.part")
+    temp.write_bytes(archive.read_bytes())
+    out = temp.with_name("r")
+    out.mkdir()
+    (out / "old.rule").write_text("old")
+    result = manager._handle_compression(temp, temp, out, Asset(name="r", category="rules", url=f"{base}/r.tar", decompress="tar"))
+    check("Swaps the extracted directory into place", (result / "rules" / "best64.rule").exists())
+    check("Replaces the previous extraction", not (result / "old.rule").exists())
+    check("Removes the archive and staging directory", not temp.exists() and not out.with_name("r.tmp").exists())
+finally:
+    server.shutdown()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+print(f"\n{'='*70}")
+print(f"Results: {passed} passed, {failed} failed")
+print(f"{'='*70}")
+
+sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test the Vast.ai client's offer cache against a local API stub."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, '/opt/vastcat')
+
+tmp = Path(tempfile.mkdtemp(prefix="vastcat-vast-"))
+os.environ["VASTCAT_CONFIG"] = str(tmp / "config.yaml")
+(tmp / "config.yaml").write_text(f"cache_dir: {tmp / 'cache'}\noffers_cache_ttl: 0.5\n")
+
+from src.vastcat.vast import VastClient
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []  # (method, path, Authorization)
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path, self.headers.get("Authorization")))
+        offers = [
+            {"id": i, "gpu_name": "RTX 4090", "dph_total": 0.4 + i, "gpu_ram": 24564, "reliability2": 0.99, "machine_id": 7}
+            for i in range(3)
+        ]
+        self._reply({"offers": offers})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.requests.append(("POST", self.path, self.headers.get("Authorization")))
+        self._reply({"success": True, "new_contract": body.get("ask")})
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def asks():
+    return [req for req in Handler.requests if req[1].startswith("/api/v0/market/asks")]
+
+
+print("=== Testing Vast.ai offer cache ===\n")
+
+passed = 0
+failed = 0
+
+
+def check(description, ok, detail=""):
+    global passed, failed
+    if ok:
+        print(f"✓ {description}")
+        passed += 1
+    else:
+        print(f"✗ {description} {detail}")
+        failed += 1
+
+
+client = VastClient(api_key="test-key", api_url=f"http://127.0.0.1:{server.server_address[1]}/api/v0")
+try:
+    offers = client.list_offers()
+    check("Parses offers", [offer.id for offer in offers] == [0, 1, 2] and offers[1].hourly == 1.4, offers)
+    check("Sends the API key", Handler.requests[-1][2] == "Bearer test-key", Handler.requests[-1])
+
+    offers.clear()
+    again = client.list_offers()
+    check("Repeat query is served from cache", len(asks()) == 1, asks())
+    check("Callers get their own copy of the cached list", len(again) == 3)
+
+    client.list_offers(limit=5)
+    check("Different parameters are fetched separately", len(asks()) == 2, asks())
+
+    time.sleep(0.6)
+    client.list_offers()
+    check("Entries expire after offers_cache_ttl", len(asks()) == 3, asks())
+
+    client.create_instance(1, "nvidia/cuda:12.4.1-runtime-ubuntu22.04", 40)
+    client.list_offers()
+    check("Creating an instance invalidates the cache", len(asks()) == 4, asks())
+
+    results = client.run_commands([(1, "nvidia-smi"), (2, "hashcat -b")])
+    check("Runs commands on several instances", len(results) == 2 and all(r["success"] for r in results))
+finally:
+    client.close()
+    server.shutdown()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+print(f"\n{'='*70}")
+print(f"Results: {passed} passed, {failed} failed")
+print(f"{'='*70}")
+
+sys.exit(0 if failed == 0 else 1)